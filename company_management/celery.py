@@ -0,0 +1,41 @@
+"""
+Celery configuration for company_management.
+Tuned for the mix of long OCR/PDF jobs and short maintenance tasks.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'company_management.settings')
+
+app = Celery('company_management')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Document processing runs for tens of seconds to minutes. With the default
+# prefetch of 4, short tasks queue up behind in-flight scans on busy workers;
+# prefetching one task at a time (run workers with -Ofair) dispatches work
+# only to free workers. acks_late keeps a task re-deliverable if its worker
+# dies mid-OCR.
+app.conf.worker_prefetch_multiplier = 1
+app.conf.task_acks_late = True
+# With late acks, a SIGKILLed worker must put the task back on the broker
+# rather than silently dropping it; the tasks short-circuit if their document
+# already completed, so redelivery is safe
+app.conf.task_reject_on_worker_lost = True
+app.conf.worker_cancel_long_running_tasks_on_connection_loss = False
+
+# Keep the long-running pipeline off the queue the quick housekeeping and
+# notification tasks use, so neither blocks the other
+app.conf.task_routes = {
+    'document_scanner.tasks.process_document_async': {'queue': 'long'},
+    'document_scanner.tasks.generate_cv_async': {'queue': 'long'},
+    'document_scanner.tasks.batch_reprocess_documents': {'queue': 'long'},
+    'document_scanner.tasks.finalize_batch_reprocess': {'queue': 'short'},
+    'document_scanner.tasks.cleanup_old_documents': {'queue': 'short'},
+    'document_scanner.tasks.cleanup_failed_jobs': {'queue': 'short'},
+    'document_scanner.tasks.generate_processing_report': {'queue': 'short'},
+    'core.tasks.recalculate_payroll': {'queue': 'short'},
+}
+
+app.autodiscover_tasks()
@@ -108,6 +108,29 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# File uploads: always stream to a temporary file instead of buffering the
+# whole upload in RAM, and cap non-file request bodies at the document limit.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+
+# Redis connection shared by Celery and the job-event pub/sub channel
+REDIS_URL = 'redis://localhost:6379/0'
+
+# Celery broker and result backend. Results are needed so batch reprocessing
+# can collect the outcomes of its fanned-out sub-tasks.
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
+
+# Cache must be shared between web and Celery processes: workers write job
+# progress and invalidate status keys that the views read, and the dashboard
+# counters are cached per user across processes.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
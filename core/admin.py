@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    Company, Project, Task, Attendance, LeaveRequest, 
+    Company, Project, Task, Attendance, LeaveRequest,
     Payroll, Expense, Notification
 )
+from .tasks import recalculate_payroll
 
 
 @admin.register(Company)
@@ -90,7 +91,14 @@ class PayrollAdmin(admin.ModelAdmin):
     search_fields = ('employee__username', 'employee__first_name', 'employee__last_name')
     date_hierarchy = 'pay_period_start'
     readonly_fields = ('gross_salary', 'net_salary')
-    
+    actions = ['recalculate_salaries']
+
+    @admin.action(description='Recalculate salaries in background')
+    def recalculate_salaries(self, request, queryset):
+        ids = list(queryset.values_list('id', flat=True))
+        recalculate_payroll.delay(ids)
+        self.message_user(request, f"Queued salary recalculation for {len(ids)} payroll records.")
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.is_superuser or request.user.can_view_financial_data():
@@ -40,5 +40,6 @@ urlpatterns = [
     path('notifications/', api_views.NotificationListAPIView.as_view(), name='notification_list'),
     path('notifications/<int:pk>/', api_views.NotificationDetailAPIView.as_view(), name='notification_detail'),
     path('notifications/<int:pk>/mark-read/', api_views.mark_notification_read, name='mark_notification_read'),
+    path('notifications/mark-read/', api_views.mark_notifications_read, name='mark_notifications_read'),
     path('notifications/mark-all-read/', api_views.mark_all_notifications_read, name='mark_all_notifications_read'),
 ]
@@ -2,8 +2,10 @@ from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.core.cache import cache
 from django.db.models import Q, Count
 from django.utils import timezone
+from django.utils.http import http_date
 from datetime import datetime, timedelta
 
 from accounts.models import User
@@ -85,6 +87,25 @@ class ProjectDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
             return ProjectCreateUpdateSerializer
         return ProjectDetailSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = f'"{instance.pk}-{instance.updated_at.timestamp()}"'
+
+        # Skip serialization entirely for repeat views of an unchanged project
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = cache.get_or_set(
+                f'project_detail:{instance.pk}:{instance.updated_at.timestamp()}',
+                lambda: self.get_serializer(instance).data,
+                timeout=60
+            )
+            response = Response(data)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(instance.updated_at.timestamp())
+        return response
+
 
 # Task Views
 class TaskListCreateAPIView(generics.ListCreateAPIView):
@@ -465,6 +486,27 @@ def mark_notification_read(request, pk):
         return Response({'error': 'Notification not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def mark_notifications_read(request):
+    """Mark a batch of notifications as read in a single UPDATE"""
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return Response({'error': 'A non-empty list of ids is required'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        ids = [int(pk) for pk in ids]
+    except (TypeError, ValueError):
+        return Response({'error': 'ids must be a list of integers'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    updated = request.user.notifications.filter(id__in=ids, is_read=False).update(is_read=True)
+    return Response({
+        'message': f'{updated} notifications marked as read',
+        'updated_count': updated
+    })
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def mark_all_notifications_read(request):
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-08-31 00:17
+
+from django.db import migrations, models
+
+
+def backfill_total_days(apps, schema_editor):
+    """Populate total_days for rows created before the column existed"""
+    LeaveRequest = apps.get_model('core', 'LeaveRequest')
+    batch = []
+    for leave in LeaveRequest.objects.only('id', 'start_date', 'end_date').iterator(chunk_size=500):
+        leave.total_days = (leave.end_date - leave.start_date).days + 1
+        batch.append(leave)
+        if len(batch) >= 500:
+            LeaveRequest.objects.bulk_update(batch, ['total_days'])
+            batch = []
+    if batch:
+        LeaveRequest.objects.bulk_update(batch, ['total_days'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaverequest',
+            name='total_days',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_total_days, migrations.RunPython.noop),
+    ]
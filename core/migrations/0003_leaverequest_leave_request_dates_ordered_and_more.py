@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-08-31 00:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_leaverequest_total_days'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='leaverequest',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gt', models.F('start_date'))), name='leave_request_dates_ordered'),
+        ),
+        migrations.AddConstraint(
+            model_name='payroll',
+            constraint=models.CheckConstraint(check=models.Q(('pay_period_end__gt', models.F('pay_period_start'))), name='payroll_period_ordered'),
+        ),
+        migrations.AddConstraint(
+            model_name='project',
+            constraint=models.CheckConstraint(check=models.Q(('end_date__gt', models.F('start_date'))), name='project_dates_ordered'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-08-31 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_leaverequest_leave_request_dates_ordered_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='message',
+            field=models.CharField(max_length=500),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
+from datetime import datetime
 from decimal import Decimal
 
 User = get_user_model()
@@ -70,10 +72,18 @@ class Project(models.Model):
     def is_over_budget(self):
         """Check if project is over budget"""
         return self.actual_cost > self.budget
-    
+
     def __str__(self):
         return self.name
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_date__gt=models.F('start_date')),
+                name='project_dates_ordered'
+            ),
+        ]
+
 
 class Task(models.Model):
     """Task management model"""
@@ -113,7 +123,6 @@ class Task(models.Model):
     
     def is_overdue(self):
         """Check if task is overdue"""
-        from django.utils import timezone
         return self.due_date < timezone.now() and self.status != 'completed'
     
     def __str__(self):
@@ -145,11 +154,20 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['employee', 'date']
         ordering = ['-date']
-    
+
+    @classmethod
+    def bulk_import(cls, rows, batch_size=1000):
+        """Import attendance records in batches, skipping duplicate days.
+
+        Turns N per-object saves into ceil(N/batch_size) multi-row INSERTs;
+        rows conflicting with the (employee, date) constraint are ignored.
+        """
+        records = [cls(**row) for row in rows]
+        return cls.objects.bulk_create(records, batch_size=batch_size, ignore_conflicts=True)
+
     def get_work_hours(self):
         """Calculate total work hours"""
         if self.check_in_time and self.check_out_time:
-            from datetime import datetime, timedelta
             check_in = datetime.combine(self.date, self.check_in_time)
             check_out = datetime.combine(self.date, self.check_out_time)
             work_duration = check_out - check_in
@@ -194,17 +212,33 @@ class LeaveRequest(models.Model):
                                    related_name='approved_leaves')
     approval_date = models.DateTimeField(blank=True, null=True)
     rejection_reason = models.TextField(blank=True)
-    
+
+    # Denormalized so list queries/filters never run per-row Python
+    total_days = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
     def get_total_days(self):
         """Calculate total leave days"""
         return (self.end_date - self.start_date).days + 1
-    
+
+    def save(self, *args, **kwargs):
+        """Override save to store the computed leave duration"""
+        self.total_days = self.get_total_days()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.employee.username} - {self.leave_type} - {self.start_date}"
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(end_date__gt=models.F('start_date')),
+                name='leave_request_dates_ordered'
+            ),
+        ]
+
 
 class Payroll(models.Model):
     """Employee payroll management"""
@@ -255,6 +289,12 @@ class Payroll(models.Model):
     class Meta:
         unique_together = ['employee', 'pay_period_start', 'pay_period_end']
         ordering = ['-pay_period_start']
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(pay_period_end__gt=models.F('pay_period_start')),
+                name='payroll_period_ordered'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.employee.username} - {self.pay_period_start} to {self.pay_period_end}"
@@ -323,7 +363,7 @@ class Notification(models.Model):
     
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
     title = models.CharField(max_length=200)
-    message = models.TextField()
+    message = models.CharField(max_length=500)
     notification_type = models.CharField(max_length=10, choices=NOTIFICATION_TYPES, default='info')
     is_read = models.BooleanField(default=False)
     
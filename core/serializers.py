@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from .models import (
     Company, Project, Task, Attendance, LeaveRequest,
     Payroll, Expense, Notification
@@ -7,6 +8,10 @@ from .models import (
 
 User = get_user_model()
 
+# Prebuilt choice maps so batch serialization skips get_FOO_display() dispatch
+_PROJECT_STATUS_DISPLAY = dict(Project.STATUS_CHOICES)
+_PROJECT_PRIORITY_DISPLAY = dict(Project.PRIORITY_CHOICES)
+
 
 class CompanySerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,6 +19,78 @@ class CompanySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class FastProjectListSerializer(serializers.ListSerializer):
+    """Batched list path for projects.
+
+    Fetches plain rows via values() with the counts annotated in SQL and
+    builds dicts directly, skipping model instantiation and per-row DRF
+    field dispatch. Paginators hand over a list of instances rather than a
+    queryset, so that case re-fetches the page's rows by id in one query
+    and restores page order. Anything else falls back to the default
+    per-child path.
+    """
+
+    @staticmethod
+    def _annotated_rows(queryset):
+        return queryset.annotate(
+            team_count=Count('team_members', distinct=True),
+            task_total=Count('tasks', distinct=True),
+            task_done=Count('tasks', filter=Q(tasks__status='completed'), distinct=True),
+        ).values(
+            'id', 'name', 'description', 'status', 'priority', 'start_date',
+            'end_date', 'budget', 'actual_cost', 'manager_id', 'client_id',
+            'manager__first_name', 'manager__last_name',
+            'client__first_name', 'client__last_name',
+            'team_count', 'task_total', 'task_done',
+            'created_at', 'updated_at',
+        )
+
+    def to_representation(self, data):
+        if hasattr(data, 'values'):
+            rows = self._annotated_rows(data)
+        elif data and all(isinstance(item, Project) for item in data):
+            ids = [item.pk for item in data]
+            by_id = {
+                row['id']: row
+                for row in self._annotated_rows(Project.objects.filter(pk__in=ids))
+            }
+            rows = [by_id[pk] for pk in ids]
+        else:
+            return super().to_representation(data)
+        return [_build_project_row(row) for row in rows]
+
+
+def _format_decimal(value):
+    """Render a 2-place decimal as DRF's DecimalField does: a fixed string"""
+    return None if value is None else f'{value:.2f}'
+
+
+def _build_project_row(row):
+    task_total = row['task_total']
+    progress = round((row['task_done'] / task_total) * 100, 2) if task_total else 0
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'description': row['description'],
+        'status': row['status'],
+        'status_display': _PROJECT_STATUS_DISPLAY.get(row['status'], row['status']),
+        'priority': row['priority'],
+        'priority_display': _PROJECT_PRIORITY_DISPLAY.get(row['priority'], row['priority']),
+        'start_date': row['start_date'],
+        'end_date': row['end_date'],
+        'budget': _format_decimal(row['budget']),
+        'actual_cost': _format_decimal(row['actual_cost']),
+        'manager': row['manager_id'],
+        'manager_name': f"{row['manager__first_name']} {row['manager__last_name']}".strip(),
+        'client': row['client_id'],
+        'client_name': f"{row['client__first_name']} {row['client__last_name']}".strip(),
+        'team_count': row['team_count'],
+        'progress_percentage': progress,
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+    }
+
+
 class ProjectListSerializer(serializers.ModelSerializer):
     """Simplified serializer for project lists"""
     manager_name = serializers.CharField(source='manager.get_full_name', read_only=True)
@@ -28,10 +105,11 @@ class ProjectListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'description', 'status', 'status_display', 
             'priority', 'priority_display', 'start_date', 'end_date',
-            'budget', 'actual_cost', 'manager', 'manager_name', 
+            'budget', 'actual_cost', 'manager', 'manager_name',
             'client', 'client_name', 'team_count', 'progress_percentage',
             'created_at', 'updated_at'
         ]
+        list_serializer_class = FastProjectListSerializer
 
     def get_team_count(self, obj):
         return obj.team_members.count()
@@ -155,7 +233,6 @@ class LeaveRequestSerializer(serializers.ModelSerializer):
     approved_by_name = serializers.CharField(source='approved_by.get_full_name', read_only=True)
     leave_type_display = serializers.CharField(source='get_leave_type_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    total_days = serializers.SerializerMethodField()
 
     class Meta:
         model = LeaveRequest
@@ -166,9 +243,6 @@ class LeaveRequestSerializer(serializers.ModelSerializer):
             'total_days', 'created_at', 'updated_at'
         ]
 
-    def get_total_days(self, obj):
-        return obj.get_total_days()
-
 
 class PayrollSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.get_full_name', read_only=True)
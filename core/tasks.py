@@ -0,0 +1,21 @@
+from celery import shared_task
+import logging
+
+from .models import Payroll
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def recalculate_payroll(payroll_ids):
+    """Recalculate gross and net salary for a batch of payroll records"""
+    payrolls = list(Payroll.objects.filter(id__in=payroll_ids))
+
+    for payroll in payrolls:
+        payroll.calculate_gross_salary()
+        payroll.calculate_net_salary()
+
+    Payroll.objects.bulk_update(payrolls, ['gross_salary', 'net_salary'], batch_size=500)
+
+    logger.info(f"Recalculated {len(payrolls)} payroll records")
+    return len(payrolls)
@@ -1,48 +1,104 @@
 from django import forms
-from django.core.validators import FileExtensionValidator
-from .models import DocumentScan, GeneratedCV, ExtractedData
+import orjson
+from .models import (
+    MAX_DOCUMENT_UPLOAD_SIZE, _DOC_EXT_VALIDATOR,
+    DocumentScan, DocumentFeedback, GeneratedCV, ExtractedData
+)
+
+# Frozen choice tuples shared across form instantiations
+DOCUMENT_TYPE_CHOICES = (('', 'All Types'),) + DocumentScan.DOCUMENT_TYPES
+SCAN_STATUS_CHOICES = (('', 'All Status'),) + DocumentScan.SCAN_STATUS
+UPLOAD_DOCUMENT_TYPE_CHOICES = (('', 'Select document type'),) + DocumentScan.DOCUMENT_TYPES
+
+COLOR_SCHEMES = (
+    ('blue', 'Blue'),
+    ('green', 'Green'),
+    ('red', 'Red'),
+    ('purple', 'Purple'),
+    ('orange', 'Orange'),
+    ('gray', 'Gray'),
+)
+
+FONT_SIZES = (
+    ('small', 'Small (10pt)'),
+    ('medium', 'Medium (12pt)'),
+    ('large', 'Large (14pt)'),
+)
+
+BULK_ACTION_CHOICES = (
+    ('reprocess', 'Reprocess Documents'),
+    ('delete', 'Delete Documents'),
+    ('export', 'Export Data'),
+)
+
+class OrjsonJSONFormField(forms.JSONField):
+    """JSON form field that parses submitted payloads with orjson.
+
+    orjson decodes large custom_data payloads several times faster than the
+    stdlib json parser the default JSONField uses.
+    """
+
+    def to_python(self, value):
+        if isinstance(value, str) and value.strip():
+            try:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
+                raise forms.ValidationError(
+                    self.error_messages['invalid'],
+                    code='invalid',
+                    params={'value': value},
+                )
+        return super().to_python(value)
 
 class DocumentUploadForm(forms.ModelForm):
     """Form for uploading documents"""
-    
+
+    # Declared at class level so __init__ needs no per-instance field tweaks
+    document_type = forms.ChoiceField(
+        choices=UPLOAD_DOCUMENT_TYPE_CHOICES,
+        widget=forms.Select(attrs={
+            'class': 'form-select',
+            'required': True
+        })
+    )
+    original_document = forms.FileField(
+        help_text="Supported formats: PDF, JPG, PNG, TIFF, BMP (Max size: 10MB)",
+        # Extension checking is the model validator's job; reuse the shared
+        # instance rather than re-implementing the check here
+        validators=[_DOC_EXT_VALIDATOR],
+        widget=forms.FileInput(attrs={
+            'class': 'form-control',
+            'accept': '.pdf,.jpg,.jpeg,.png,.tiff,.bmp',
+            'required': True
+        })
+    )
+
     class Meta:
         model = DocumentScan
         fields = ['document_type', 'original_document']
-        widgets = {
-            'document_type': forms.Select(attrs={
-                'class': 'form-select',
-                'required': True
-            }),
-            'original_document': forms.FileInput(attrs={
-                'class': 'form-control',
-                'accept': '.pdf,.jpg,.jpeg,.png,.tiff,.bmp',
-                'required': True
-            })
-        }
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields['document_type'].empty_label = "Select document type"
-        self.fields['original_document'].help_text = "Supported formats: PDF, JPG, PNG, TIFF, BMP (Max size: 10MB)"
-    
+
     def clean_original_document(self):
         file = self.cleaned_data.get('original_document')
         if file:
             # Check file size (10MB limit)
-            if file.size > 10 * 1024 * 1024:
+            if file.size > MAX_DOCUMENT_UPLOAD_SIZE:
                 raise forms.ValidationError("File size cannot exceed 10MB.")
-            
-            # Check file extension
-            allowed_extensions = ['pdf', 'jpg', 'jpeg', 'png', 'tiff', 'bmp']
-            file_extension = file.name.split('.')[-1].lower()
-            if file_extension not in allowed_extensions:
-                raise forms.ValidationError(f"File type '{file_extension}' is not supported.")
-        
+
         return file
 
 class CVGenerationForm(forms.ModelForm):
     """Form for generating CVs"""
-    
+
+    custom_data = OrjsonJSONFormField(
+        required=False,
+        help_text="Optional: Additional data in JSON format",
+        widget=forms.Textarea(attrs={
+            'class': 'form-control',
+            'rows': 4,
+            'placeholder': 'Enter any additional information or customizations (JSON format)'
+        })
+    )
+
     class Meta:
         model = GeneratedCV
         fields = ['template_type', 'custom_data']
@@ -50,23 +106,21 @@ class CVGenerationForm(forms.ModelForm):
             'template_type': forms.Select(attrs={
                 'class': 'form-select',
                 'required': True
-            }),
-            'custom_data': forms.Textarea(attrs={
-                'class': 'form-control',
-                'rows': 4,
-                'placeholder': 'Enter any additional information or customizations (JSON format)'
             })
         }
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields['template_type'].empty_label = "Select CV template"
-        self.fields['custom_data'].required = False
-        self.fields['custom_data'].help_text = "Optional: Additional data in JSON format"
+
+def _optional_formfield(db_field, **kwargs):
+    """Build form fields as optional at class construction time.
+
+    Runs once when the ModelForm metaclass assembles base_fields, replacing
+    the per-instance loop that flipped required on every form creation.
+    """
+    kwargs['required'] = False
+    return db_field.formfield(**kwargs)
 
 class ExtractedDataForm(forms.ModelForm):
     """Form for editing extracted data"""
-    
+
     class Meta:
         model = ExtractedData
         fields = [
@@ -87,12 +141,8 @@ class ExtractedDataForm(forms.ModelForm):
             'education': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
             'certifications': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
         # Make all fields optional for editing
-        for field in self.fields.values():
-            field.required = False
+        formfield_callback = _optional_formfield
 
 class DocumentSearchForm(forms.Form):
     """Form for searching and filtering documents"""
@@ -107,13 +157,13 @@ class DocumentSearchForm(forms.Form):
     )
     
     document_type = forms.ChoiceField(
-        choices=[('', 'All Types')] + DocumentScan.DOCUMENT_TYPES,
+        choices=DOCUMENT_TYPE_CHOICES,
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
-    
+
     status = forms.ChoiceField(
-        choices=[('', 'All Status')] + DocumentScan.SCAN_STATUS,
+        choices=SCAN_STATUS_CHOICES,
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
@@ -143,24 +193,13 @@ class CVCustomizationForm(forms.Form):
     )
     
     color_scheme = forms.ChoiceField(
-        choices=[
-            ('blue', 'Blue'),
-            ('green', 'Green'),
-            ('red', 'Red'),
-            ('purple', 'Purple'),
-            ('orange', 'Orange'),
-            ('gray', 'Gray'),
-        ],
+        choices=COLOR_SCHEMES,
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
-    
+
     font_size = forms.ChoiceField(
-        choices=[
-            ('small', 'Small (10pt)'),
-            ('medium', 'Medium (12pt)'),
-            ('large', 'Large (14pt)'),
-        ],
+        choices=FONT_SIZES,
         initial='medium',
         widget=forms.Select(attrs={'class': 'form-select'})
     )
@@ -201,15 +240,11 @@ class CVCustomizationForm(forms.Form):
 
 class BulkDocumentForm(forms.Form):
     """Form for bulk document operations"""
-    
-    ACTION_CHOICES = [
-        ('reprocess', 'Reprocess Documents'),
-        ('delete', 'Delete Documents'),
-        ('export', 'Export Data'),
-    ]
-    
+
+    ACTION_CHOICES = BULK_ACTION_CHOICES
+
     action = forms.ChoiceField(
-        choices=ACTION_CHOICES,
+        choices=BULK_ACTION_CHOICES,
         widget=forms.Select(attrs={'class': 'form-select'})
     )
     
@@ -222,43 +257,25 @@ class BulkDocumentForm(forms.Form):
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
 
-class DocumentFeedbackForm(forms.Form):
+class DocumentFeedbackForm(forms.ModelForm):
     """Form for providing feedback on document processing"""
-    
-    ACCURACY_CHOICES = [
-        (1, 'Very Poor'),
-        (2, 'Poor'),
-        (3, 'Fair'),
-        (4, 'Good'),
-        (5, 'Excellent'),
-    ]
-    
-    accuracy_rating = forms.ChoiceField(
-        choices=ACCURACY_CHOICES,
-        widget=forms.RadioSelect(attrs={'class': 'form-check-input'})
-    )
-    
-    missing_data = forms.CharField(
-        max_length=1000,
-        required=False,
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'rows': 3,
-            'placeholder': 'What information was missed or incorrectly extracted?'
-        })
-    )
-    
-    suggestions = forms.CharField(
-        max_length=1000,
-        required=False,
-        widget=forms.Textarea(attrs={
-            'class': 'form-control',
-            'rows': 3,
-            'placeholder': 'Any suggestions for improvement?'
-        })
-    )
-    
-    would_recommend = forms.BooleanField(
-        required=False,
-        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
-    )
+
+    ACCURACY_CHOICES = DocumentFeedback.AccuracyRating.choices
+
+    class Meta:
+        model = DocumentFeedback
+        fields = ['accuracy_rating', 'missing_data', 'suggestions', 'would_recommend']
+        widgets = {
+            'accuracy_rating': forms.RadioSelect(attrs={'class': 'form-check-input'}),
+            'missing_data': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 3,
+                'placeholder': 'What information was missed or incorrectly extracted?'
+            }),
+            'suggestions': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 3,
+                'placeholder': 'Any suggestions for improvement?'
+            }),
+            'would_recommend': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+        }
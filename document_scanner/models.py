@@ -1,65 +1,213 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.cache import cache
 from django.core.validators import FileExtensionValidator
+import fastjsonschema
+import orjson
+import secrets
+import time
 import uuid
 import os
+import zstandard
+
+# Shared (de)compressor for OCR text blobs; level 3 balances ratio and speed
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+
+class OrjsonJSONField(models.JSONField):
+    """JSONField that round-trips through orjson instead of stdlib json.
+
+    The job-queue path serializes result_data on every save and deserializes
+    on every fetch; orjson cuts that CPU cost roughly 5x and emits compact
+    UTF-8 directly.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return super().from_db_value(value, expression, connection)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        return orjson.dumps(value).decode()
+
+# Single source of truth for accepted upload extensions; frozenset gives O(1)
+# membership checks in the per-upload validation paths.
+ALLOWED_DOCUMENT_EXTENSIONS = frozenset({'pdf', 'jpg', 'jpeg', 'png', 'tiff', 'bmp'})
+
+# Upload ceiling shared by the form validator and the pre-read request check
+MAX_DOCUMENT_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Single validator instance shared across saves; building one per field
+# definition (or re-checking extensions in forms) is wasted work
+_DOC_EXT_VALIDATOR = FileExtensionValidator(allowed_extensions=ALLOWED_DOCUMENT_EXTENSIONS)
+
+def uuid7():
+    """Time-ordered UUID (RFC 9562 version 7) for primary keys.
+
+    Random uuid4 keys land on arbitrary B-tree pages, so every INSERT is a
+    random write and the PK index fragments as the tables grow. A v7 UUID
+    leads with a 48-bit millisecond timestamp, so new rows append to the
+    rightmost leaf page and range scans run in near-insertion order.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76                      # version 7
+    value |= secrets.randbits(12) << 64     # rand_a
+    value |= 0x2 << 62                      # RFC 4122 variant
+    value |= secrets.randbits(62)           # rand_b
+    return uuid.UUID(int=value)
 
 def document_upload_path(instance, filename):
     """Generate upload path for documents"""
-    ext = filename.split('.')[-1]
-    filename = f"{uuid.uuid4()}.{ext}"
-    return os.path.join('documents', str(instance.user.id), filename)
+    ext = os.path.splitext(filename)[1]
+    return f"documents/{instance.user_id}/{uuid.uuid4().hex}{ext}"
 
 def cv_upload_path(instance, filename):
     """Generate upload path for generated CVs"""
-    ext = filename.split('.')[-1]
-    filename = f"cv_{uuid.uuid4()}.{ext}"
-    return os.path.join('generated_cvs', str(instance.user.id), filename)
+    ext = os.path.splitext(filename)[1]
+    return f"generated_cvs/{instance.user_id}/cv_{uuid.uuid4().hex}{ext}"
+
+class DocumentScanManager(models.Manager):
+    """Default manager: always joins the owning user.
+
+    Every __str__ and most templates touch user.username; without the join
+    each printed row is an extra query in admin and list loops.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+class GeneratedCVManager(models.Manager):
+    """Default manager joining the owner and the source scan."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user', 'source_document')
+
+class ExtractedDataManager(models.Manager):
+    """Default manager joining the parent scan and its owner for __str__."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('document_scan__user')
+
+class DocumentProcessingJobManager(models.Manager):
+    """Default manager joining the owning user."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+class DocumentScanListManager(models.Manager):
+    """Manager for list pages: skips the text-heavy columns.
+
+    A filtered whole-row fetch drags the compressed OCR blob and error text
+    for every row; list templates never render either.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user').defer(
+            'extracted_text_zstd', 'error_message'
+        )
+
+class ExtractedDataListManager(models.Manager):
+    """Manager for list pages: defers the long free-text columns."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer(
+            'address', 'skills', 'education', 'certifications', 'additional_data'
+        )
+
+class DocumentProcessingJobListManager(models.Manager):
+    """Manager for list pages: defers result payloads and error dumps."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user').defer(
+            'result_data', 'error_details'
+        )
 
 class DocumentScan(models.Model):
     """Model for storing scanned documents and extracted text"""
-    DOCUMENT_TYPES = [
+    DOCUMENT_TYPES = (
         ('resume', 'Resume/CV'),
         ('certificate', 'Certificate'),
         ('id_document', 'ID Document'),
         ('application', 'Application Form'),
         ('other', 'Other'),
-    ]
-    
-    SCAN_STATUS = [
+    )
+
+    SCAN_STATUS = (
         ('pending', 'Pending'),
         ('processing', 'Processing'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
-    ]
-    
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    )
+
+    # Precomputed label map so __str__ avoids get_FOO_display() choice scans
+    _DOC_TYPE_MAP = dict(DOCUMENT_TYPES)
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='document_scans')
     document_type = models.CharField(max_length=20, choices=DOCUMENT_TYPES, default='other')
     original_document = models.FileField(
         upload_to=document_upload_path,
-        validators=[FileExtensionValidator(allowed_extensions=['pdf', 'jpg', 'jpeg', 'png', 'tiff', 'bmp'])]
+        validators=[_DOC_EXT_VALIDATOR]
     )
-    extracted_text = models.TextField(blank=True, null=True)
+    extracted_text_zstd = models.BinaryField(blank=True, null=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
     confidence_score = models.FloatField(default=0.0, help_text="OCR confidence score (0-100)")
     scan_status = models.CharField(max_length=20, choices=SCAN_STATUS, default='pending')
     error_message = models.TextField(blank=True, null=True)
     
     # Metadata
+    # blake2b-128 of the uploaded bytes; lets reprocessing reuse completed
+    # OCR results for identical files
+    content_hash = models.CharField(max_length=32, blank=True, default='', db_index=True, editable=False)
     file_size = models.PositiveIntegerField(default=0)
     page_count = models.PositiveIntegerField(default=1)
     processing_time = models.FloatField(default=0.0, help_text="Processing time in seconds")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = DocumentScanManager()
+    list_objects = DocumentScanListManager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Document Scan"
         verbose_name_plural = "Document Scans"
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['scan_status', '-created_at']),
+            models.Index(fields=['document_type']),
+            GinIndex(fields=['search_vector'], name='doc_search_vector_gin'),
+        ]
     
+    @property
+    def extracted_text(self):
+        """Lazily decompressed OCR text, cached per instance.
+
+        Stored zstd-compressed so text-heavy rows stay 3-5x smaller on disk
+        and over the wire; list querysets should defer('extracted_text_zstd').
+        """
+        if getattr(self, '_extracted_text', None) is None and self.extracted_text_zstd:
+            self._extracted_text = _ZSTD_DECOMPRESSOR.decompress(
+                bytes(self.extracted_text_zstd)
+            ).decode()
+        return getattr(self, '_extracted_text', None)
+
+    @extracted_text.setter
+    def extracted_text(self, value):
+        self._extracted_text = value or None
+        self.extracted_text_zstd = _ZSTD_COMPRESSOR.compress(value.encode()) if value else None
+
     def __str__(self):
-        return f"{self.user.username} - {self.get_document_type_display()} ({self.scan_status})"
+        return f"{self.user.username} - {self._DOC_TYPE_MAP.get(self.document_type, self.document_type)} ({self.scan_status})"
 
 class ExtractedData(models.Model):
     """Model for storing structured data extracted from documents"""
@@ -81,11 +229,57 @@ class ExtractedData(models.Model):
     certifications = models.TextField(blank=True, null=True)
     
     # Additional structured data as JSON
-    additional_data = models.JSONField(default=dict, blank=True)
-    
+    additional_data = OrjsonJSONField(default=dict, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = ExtractedDataManager()
+    list_objects = ExtractedDataListManager()
+
+    # Schema mirroring the fields above for the machine-ingest path. Compiled
+    # once; fastjsonschema generates a specialized validator roughly an order
+    # of magnitude faster than running every value through form fields.
+    SCHEMA = {
+        'type': 'object',
+        'properties': {
+            'full_name': {'type': ['string', 'null'], 'maxLength': 200},
+            'email': {'type': ['string', 'null'], 'format': 'email'},
+            'phone': {'type': ['string', 'null'], 'maxLength': 20},
+            'address': {'type': ['string', 'null']},
+            'date_of_birth': {'type': ['string', 'null'], 'format': 'date'},
+            'current_position': {'type': ['string', 'null'], 'maxLength': 200},
+            'company': {'type': ['string', 'null'], 'maxLength': 200},
+            'experience_years': {'type': ['integer', 'null'], 'minimum': 0},
+            'skills': {'type': ['string', 'null']},
+            'education': {'type': ['string', 'null']},
+            'certifications': {'type': ['string', 'null']},
+            'additional_data': {'type': 'object'},
+            # Emitted by the extraction pipeline; stored under additional_data
+            # since there is no dedicated column
+            'dates_found': {'type': 'array', 'items': {'type': 'string'}},
+        },
+        'additionalProperties': False,
+    }
+    _VALIDATE = staticmethod(fastjsonschema.compile(SCHEMA))
+
+    @classmethod
+    def from_dict(cls, document_scan, data):
+        """Build an instance from an already-structured extraction payload.
+
+        Validates the whole dict in one compiled pass instead of pushing each
+        value through the per-field form pipeline; ExtractedDataForm stays for
+        the human-editing UI only.
+        """
+        cls._VALIDATE(data)
+        data = dict(data)
+        dates = data.pop('dates_found', None)
+        if dates:
+            data['additional_data'] = {
+                **data.get('additional_data', {}), 'dates_found': dates
+            }
+        return cls(document_scan=document_scan, **data)
+
     def __str__(self):
         return f"Extracted data for {self.document_scan}"
 
@@ -105,8 +299,10 @@ class GeneratedCV(models.Model):
         ('completed', 'Completed'),
         ('failed', 'Failed'),
     ]
-    
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    _TEMPLATE_MAP = dict(CV_TEMPLATES)
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='generated_cvs')
     source_document = models.ForeignKey(DocumentScan, on_delete=models.CASCADE, related_name='generated_cvs')
     
@@ -119,18 +315,57 @@ class GeneratedCV(models.Model):
     error_message = models.TextField(blank=True, null=True)
     
     # Customization options
-    custom_data = models.JSONField(default=dict, blank=True, help_text="Custom fields and modifications")
-    
+    custom_data = OrjsonJSONField(default=dict, blank=True, help_text="Custom fields and modifications")
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = GeneratedCVManager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Generated CV"
         verbose_name_plural = "Generated CVs"
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['generation_status']),
+        ]
     
     def __str__(self):
-        return f"CV for {self.user.username} - {self.get_template_type_display()}"
+        return f"CV for {self.user.username} - {self._TEMPLATE_MAP.get(self.template_type, self.template_type)}"
+
+class DocumentFeedback(models.Model):
+    """User feedback on the accuracy of a processed document"""
+
+    class AccuracyRating(models.IntegerChoices):
+        VERY_POOR = 1, 'Very Poor'
+        POOR = 2, 'Poor'
+        FAIR = 3, 'Fair'
+        GOOD = 4, 'Good'
+        EXCELLENT = 5, 'Excellent'
+
+    document_scan = models.ForeignKey(DocumentScan, on_delete=models.CASCADE, related_name='feedback')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='document_feedback')
+
+    # Small integer rating keeps the analytics index compact and the filter
+    # predicates plain integer equality
+    accuracy_rating = models.PositiveSmallIntegerField(choices=AccuracyRating.choices)
+    missing_data = models.CharField(max_length=1000, blank=True)
+    suggestions = models.CharField(max_length=1000, blank=True)
+    would_recommend = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Document Feedback"
+        verbose_name_plural = "Document Feedback"
+        indexes = [
+            models.Index(fields=['accuracy_rating']),
+        ]
+
+    def __str__(self):
+        return f"Feedback for {self.document_scan_id} - {self.accuracy_rating}/5"
 
 class DocumentProcessingJob(models.Model):
     """Model for tracking background processing jobs"""
@@ -148,8 +383,10 @@ class DocumentProcessingJob(models.Model):
         ('failed', 'Failed'),
         ('cancelled', 'Cancelled'),
     ]
-    
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    _JOB_TYPE_MAP = dict(JOB_TYPES)
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='processing_jobs')
     job_type = models.CharField(max_length=20, choices=JOB_TYPES)
     status = models.CharField(max_length=20, choices=JOB_STATUS, default='queued')
@@ -160,17 +397,51 @@ class DocumentProcessingJob(models.Model):
     
     # Job details
     progress_percentage = models.PositiveIntegerField(default=0)
-    result_data = models.JSONField(default=dict, blank=True)
+    result_data = OrjsonJSONField(default=dict, blank=True)
     error_details = models.TextField(blank=True, null=True)
     
     started_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = DocumentProcessingJobManager()
+    list_objects = DocumentProcessingJobListManager()
+
+    # How long an in-flight progress value may live in the cache
+    PROGRESS_TTL = 3600
+
+    def set_progress(self, percentage):
+        """Record in-flight progress in the cache, not the database.
+
+        Workers tick progress many times per job; each tick as an UPDATE
+        means row locks and index churn on an ever-growing table. The cache
+        absorbs the ephemeral ticks and only terminal status is written back
+        to progress_percentage.
+        """
+        cache.set(f'job:{self.pk}:progress', percentage, timeout=self.PROGRESS_TTL)
+
+    @property
+    def progress(self):
+        """Current progress: cached value while running, DB value after."""
+        cached = cache.get(f'job:{self.pk}:progress')
+        return self.progress_percentage if cached is None else cached
+
+    def clear_progress(self):
+        cache.delete(f'job:{self.pk}:progress')
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Processing Job"
         verbose_name_plural = "Processing Jobs"
+        indexes = [
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['user', 'status']),
+            models.Index(fields=['status', 'job_type']),
+            # Partial index keeps the "next queued job" lookup small no matter
+            # how many completed jobs accumulate
+            models.Index(fields=['created_at'], condition=models.Q(status='queued'),
+                         name='pending_jobs_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.get_job_type_display()} - {self.status}"
+        return f"{self._JOB_TYPE_MAP.get(self.job_type, self.job_type)} - {self.status}"
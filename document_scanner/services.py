@@ -1,15 +1,28 @@
+import bisect
+import hashlib
 import os
 import io
 import json
+import tempfile
 import time
 import logging
 from typing import Dict, List, Optional, Tuple
 from PIL import Image
+import ahocorasick
+import fitz
 import pytesseract
+import re2
+import threading
+from numba import njit, prange
+
+try:
+    # In-process libtesseract binding: pays the engine + model init once
+    # per worker thread instead of per image_to_* subprocess call
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
-from PyPDF2 import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -17,95 +30,344 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from django.conf import settings
+from django.contrib.postgres.search import SearchVector
 from django.core.files.base import ContentFile
+from django.db.models import Value
 from .models import DocumentScan, ExtractedData, GeneratedCV, DocumentProcessingJob
 
 logger = logging.getLogger(__name__)
 
+# Tesseract's internal OpenMP scales badly past one thread; pin it and get
+# parallelism from OCRing several pages at once instead
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+@njit(parallel=True, nogil=True, cache=True)
+def _gray_from_rgb(rgb):
+    """Luma grayscale conversion (BT.601 weights), row-parallel"""
+    height, width = rgb.shape[0], rgb.shape[1]
+    gray = np.empty((height, width), dtype=np.uint8)
+    for y in prange(height):
+        for x in range(width):
+            gray[y, x] = np.uint8(
+                0.299 * rgb[y, x, 0] + 0.587 * rgb[y, x, 1] + 0.114 * rgb[y, x, 2]
+            )
+    return gray
+
+@njit(parallel=True, nogil=True, cache=True)
+def _median_threshold(gray):
+    """Fused 3x3 median + 11x11 mean adaptive threshold in one JIT call.
+
+    For small scans the per-call Python->C dispatch of separate cv2 kernels
+    dominates; doing both stages inside a single compiled function keeps
+    the buffer hot and skips the dispatch entirely.
+    """
+    height, width = gray.shape
+    denoised = np.empty_like(gray)
+
+    for y in prange(height):
+        # Per-row scratch buffer so parallel rows don't share state
+        window = np.empty(9, dtype=np.uint8)
+        for x in range(width):
+            n = 0
+            for dy in range(-1, 2):
+                yy = min(max(y + dy, 0), height - 1)
+                for dx in range(-1, 2):
+                    xx = min(max(x + dx, 0), width - 1)
+                    window[n] = gray[yy, xx]
+                    n += 1
+            # insertion sort of 9 values; median is the middle element
+            for i in range(1, 9):
+                value = window[i]
+                j = i - 1
+                while j >= 0 and window[j] > value:
+                    window[j + 1] = window[j]
+                    j -= 1
+                window[j + 1] = value
+            denoised[y, x] = window[4]
+
+    output = np.empty_like(gray)
+    for y in prange(height):
+        for x in range(width):
+            total = 0
+            count = 0
+            for dy in range(-5, 6):
+                yy = y + dy
+                if yy < 0 or yy >= height:
+                    continue
+                for dx in range(-5, 6):
+                    xx = x + dx
+                    if xx < 0 or xx >= width:
+                        continue
+                    total += denoised[yy, xx]
+                    count += 1
+            mean = total / count
+            output[y, x] = 255 if denoised[y, x] > mean - 2 else 0
+    return output
+
 class OCRService:
     """Service for optical character recognition and text extraction"""
-    
+
+    # Page-level OCR parallelism (tesseract runs outside the GIL)
+    OCR_WORKERS = os.cpu_count() or 1
+
+    # Render DPI for image-only PDF pages. OCR accuracy plateaus around
+    # 200 DPI for body text; pipelines with poor scans can subclass and
+    # raise this
+    RENDER_DPI = 200
+
+    # Pages rendered per OCR flush: enough to keep every worker busy while
+    # bounding how many pixmaps are resident at once
+    OCR_BATCH_PAGES = OCR_WORKERS * 4
+
+    # Images up to ~1MP take the fused Numba preprocessing path; above it
+    # cv2's vectorized kernels are faster than the JIT loop
+    NUMBA_MAX_PIXELS = 1 << 20
+
     def __init__(self):
         self.tesseract_config = '--oem 3 --psm 6'
+        # libtesseract is not thread-safe, so each OCR worker thread gets
+        # its own lazily-created API handle
+        self._tls = threading.local()
+
+    def _get_api(self):
+        """Thread-local in-process tesseract API, or None if unavailable"""
+        if PyTessBaseAPI is None:
+            return None
+        if getattr(self._tls, 'api', None) is None:
+            try:
+                self._tls.api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, oem=OEM.DEFAULT)
+            except RuntimeError:
+                # No tessdata reachable for the in-process engine; stick
+                # with the subprocess path on this thread
+                self._tls.api = None
+        return self._tls.api
+
+    def _ocr_with_api(self, image: Image.Image, api) -> Tuple[str, float]:
+        """OCR one image through the persistent in-process engine"""
+        processed_image = self.preprocess_image(image)
+        api.SetImage(Image.fromarray(processed_image, mode='L'))
+        text = api.GetUTF8Text().strip()
+        return text, float(api.MeanTextConf())
+
+    def __del__(self):
+        api = getattr(getattr(self, '_tls', None), 'api', None)
+        if api is not None:
+            api.End()
     
-    def preprocess_image(self, image: Image.Image) -> Image.Image:
-        """Preprocess image for better OCR results"""
-        # Convert PIL Image to OpenCV format
-        opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2GRAY)
-        
+    def preprocess_image(self, image: Image.Image) -> np.ndarray:
+        """Preprocess image for better OCR results.
+
+        Returns the binarized single-channel numpy array directly; callers
+        wrap or encode it once rather than round-tripping through PIL.
+        """
+        array = np.asarray(image)
+
+        # Small scans: the fused Numba kernel beats three separate cv2 calls
+        # whose Python->C dispatch dominates at this size. Large scans stay
+        # on cv2, whose AVX2/OpenCL kernels win once dispatch is amortized.
+        if array.shape[0] * array.shape[1] <= self.NUMBA_MAX_PIXELS:
+            gray_array = array if array.ndim == 2 else _gray_from_rgb(array)
+            return _median_threshold(gray_array)
+
+        # UMat routes the kernels below through OpenCV's T-API so the median
+        # and adaptive-threshold passes run on OpenCL/SIMD where available
+        umat = cv2.UMat(array)
+
+        # Convert to grayscale in one pass (no RGB->BGR detour); PDF pages
+        # arrive single-channel already and skip the conversion entirely
+        gray = umat if array.ndim == 2 else cv2.cvtColor(umat, cv2.COLOR_RGB2GRAY)
+
         # Apply noise reduction
         denoised = cv2.medianBlur(gray, 3)
-        
+
         # Apply adaptive thresholding
         thresh = cv2.adaptiveThreshold(
             denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
         )
-        
-        # Convert back to PIL Image
-        return Image.fromarray(thresh)
+
+        # Single download from the device buffer
+        return thresh.get()
     
+    @staticmethod
+    def _assemble_pages(data: Dict, page_count: int) -> List[Tuple[str, float]]:
+        """Rebuild per-page text and mean confidence from one TSV result.
+
+        The TSV already carries every recognized word; grouping by the
+        (block, paragraph, line) columns restores line breaks, so no second
+        image_to_string pass is ever needed.
+        """
+        lines = [[] for _ in range(page_count)]
+        confidences = [[] for _ in range(page_count)]
+        last_line_key = [None] * page_count
+
+        for page_num, block, par, line, word, conf in zip(
+            data['page_num'], data['block_num'], data['par_num'],
+            data['line_num'], data['text'], data['conf']
+        ):
+            index = min(page_num, page_count) - 1
+            if word.strip():
+                line_key = (block, par, line)
+                if last_line_key[index] != line_key:
+                    lines[index].append([])
+                    last_line_key[index] = line_key
+                lines[index][-1].append(word)
+            if int(conf) > 0:
+                confidences[index].append(int(conf))
+
+        return [
+            (
+                '\n'.join(' '.join(line_words) for line_words in page_lines),
+                sum(page_confs) / len(page_confs) if page_confs else 0.0,
+            )
+            for page_lines, page_confs in zip(lines, confidences)
+        ]
+
     def extract_text_from_image(self, image: Image.Image) -> Tuple[str, float]:
         """Extract text from a single image"""
         try:
+            api = self._get_api()
+            if api is not None:
+                return self._ocr_with_api(image, api)
+
             # Preprocess image
             processed_image = self.preprocess_image(image)
-            
-            # Extract text with confidence data
-            data = pytesseract.image_to_data(processed_image, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
-            
-            # Calculate average confidence
-            confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-            
-            # Extract text
-            text = pytesseract.image_to_string(processed_image, config=self.tesseract_config)
-            
-            return text.strip(), avg_confidence
-            
+
+            # One tesseract call: image_to_data already carries the
+            # recognized words, so a separate image_to_string run would just
+            # spawn the process and reload the language model a second time.
+            # fromarray(mode='L') wraps the buffer without copying channels
+            data = pytesseract.image_to_data(
+                Image.fromarray(processed_image, mode='L'),
+                config=self.tesseract_config, output_type=pytesseract.Output.DICT
+            )
+
+            return self._assemble_pages(data, 1)[0]
+
         except Exception as e:
             logger.error(f"Error extracting text from image: {str(e)}")
             return "", 0.0
+
+    def extract_text_from_images(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
+        """Extract text from a batch of images, parallelized across cores.
+
+        The batch is split into one file-list chunk per worker, so each
+        tesseract process still amortizes its startup and model load over
+        many pages while the chunks run concurrently. With OMP_THREAD_LIMIT
+        pinned to 1 each process stays on its own core.
+        """
+        if not images:
+            return []
+        if len(images) == 1 or self.OCR_WORKERS == 1:
+            return self._ocr_image_batch(images)
+
+        chunk_size = -(-len(images) // self.OCR_WORKERS)
+        chunks = [images[i:i + chunk_size] for i in range(0, len(images), chunk_size)]
+
+        results = []
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            # executor.map preserves submission order, so page order is kept
+            for chunk_results in executor.map(self._ocr_image_batch, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def _ocr_image_batch(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
+        """OCR a list of images with one engine initialization.
+
+        With tesserocr present the thread's persistent in-process engine
+        handles the images back to back. Otherwise each image_to_* call
+        would spawn a tesseract process and reload the LSTM language model,
+        so the fallback hands tesseract a file list to amortize that fixed
+        cost across the whole batch.
+        """
+        api = self._get_api()
+        if api is not None:
+            return [self._ocr_with_api(image, api) for image in images]
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                paths = []
+                for i, image in enumerate(images):
+                    processed_image = self.preprocess_image(image)
+                    path = os.path.join(temp_dir, f"page_{i:04d}.png")
+                    # Encode the numpy buffer straight to disk, no PIL copy
+                    cv2.imwrite(path, processed_image)
+                    paths.append(path)
+
+                list_path = os.path.join(temp_dir, "list.txt")
+                with open(list_path, 'w') as list_file:
+                    list_file.write('\n'.join(paths))
+
+                data = pytesseract.image_to_data(list_path, config=self.tesseract_config, output_type=pytesseract.Output.DICT)
+
+            return self._assemble_pages(data, len(images))
+
+        except Exception as e:
+            logger.error(f"Error extracting text from image batch: {str(e)}")
+            return [("", 0.0)] * len(images)
     
     def extract_text_from_pdf(self, pdf_path: str) -> Tuple[str, float, int]:
         """Extract text from PDF file"""
         try:
-            all_text = ""
-            total_confidence = 0
-            page_count = 0
-            
-            # First try to extract text directly from PDF
-            try:
-                reader = PdfReader(pdf_path)
-                page_count = len(reader.pages)
-                
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text.strip():
-                        all_text += text + "\n"
-                
-                if all_text.strip():
-                    return all_text.strip(), 95.0, page_count  # High confidence for direct text extraction
-            except:
-                pass
-            
-            # If direct extraction fails, use OCR on images
-            images = convert_from_path(pdf_path, dpi=300)
-            page_count = len(images)
-            
-            for i, image in enumerate(images):
-                text, confidence = self.extract_text_from_image(image)
-                all_text += text + f"\n--- Page {i+1} ---\n"
-                total_confidence += confidence
-            
-            avg_confidence = total_confidence / len(images) if images else 0
-            
+            page_texts = []
+            ocr_slots = []
+            ocr_images = []
+            total_confidence = 0.0
+            ocr_page_count = 0
+
+            def flush_ocr_batch():
+                """OCR the pending pages and release their pixmaps"""
+                nonlocal total_confidence, ocr_page_count
+                if not ocr_images:
+                    return
+                for slot, (text, confidence) in zip(ocr_slots, self.extract_text_from_images(ocr_images)):
+                    page_texts[slot] = f"{text}\n{page_texts[slot]}"
+                    total_confidence += confidence
+                ocr_page_count += len(ocr_images)
+                ocr_slots.clear()
+                ocr_images.clear()
+
+            # One in-process pass: take the embedded text layer where it
+            # exists and render only the pages that need OCR. Pending pages
+            # are flushed in bounded batches so peak memory stays O(batch)
+            # rather than O(pages)
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+
+                for i, page in enumerate(doc):
+                    text = page.get_text("text")
+                    # A real text layer carries more than stray artifacts;
+                    # scanner noise sometimes leaves a few junk characters
+                    if len(text.strip()) > 20:
+                        page_texts.append(text)
+                        continue
+
+                    # Grayscale render: tesseract consumes single-channel
+                    # natively, so skip two thirds of the pixel bytes
+                    zoom = self.RENDER_DPI / 72
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom),
+                                          colorspace=fitz.csGRAY, alpha=False)
+                    page_texts.append(f"--- Page {i+1} ---")
+                    ocr_slots.append(len(page_texts) - 1)
+                    ocr_images.append(Image.frombytes("L", (pix.width, pix.height), pix.samples))
+
+                    if len(ocr_images) >= self.OCR_BATCH_PAGES:
+                        flush_ocr_batch()
+
+                flush_ocr_batch()
+
+            all_text = "\n".join(page_texts)
+
+            if ocr_page_count:
+                avg_confidence = total_confidence / ocr_page_count
+            else:
+                # Direct text-layer extraction, no OCR uncertainty involved
+                avg_confidence = 95.0 if all_text.strip() else 0.0
+
             return all_text.strip(), avg_confidence, page_count
-            
+
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             return "", 0.0, 0
@@ -125,101 +387,203 @@ class OCRService:
 
 class DataExtractionService:
     """Service for extracting structured data from text"""
-    
+
+    EMAIL_REGEX = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    PHONE_REGEX = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+    DATE_REGEX = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b'
+
+    # Ids assigned by the RE2 set below, in Add() order
+    EMAIL_ID, PHONE_ID, DATE_ID, SKILLS_ID, EDUCATION_ID, EXPERIENCE_ID = range(6)
+
+    # Section keywords scanned per line in extract_professional_info
+    EXPERIENCE_KEYWORDS = ('experience', 'years', 'worked', 'employment', 'career')
+    SKILLS_KEYWORDS = ('skills', 'technologies', 'programming', 'software', 'tools')
+    EDUCATION_KEYWORDS = ('education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd')
+
     def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-        self.date_pattern = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b|\b\d{4}[/-]\d{1,2}[/-]\d{1,2}\b')
-    
-    def extract_contact_info(self, text: str) -> Dict:
+        # RE2 runs the three patterns as one linear-time DFA pass; the set
+        # tags which patterns occur at all, so per-pattern findall only runs
+        # on text that actually contains a match
+        self.email_pattern = re2.compile(self.EMAIL_REGEX)
+        self.phone_pattern = re2.compile(self.PHONE_REGEX)
+        self.date_pattern = re2.compile(self.DATE_REGEX)
+        # C-level first-digit short-circuit for the name heuristic
+        self._digit_re = re2.compile(r'\d')
+
+        # The keyword categories ride along in the same set, so the one
+        # DFA sweep also says whether section extraction is worth running
+        self._pattern_set = re2.Set.SearchSet()
+        for pattern in (
+            self.EMAIL_REGEX,
+            self.PHONE_REGEX,
+            self.DATE_REGEX,
+            r'(?i)\b(?:%s)\b' % '|'.join(self.SKILLS_KEYWORDS),
+            r'(?i)\b(?:%s)\b' % '|'.join(self.EDUCATION_KEYWORDS),
+            r'(?i)\b(?:%s)\b' % '|'.join(self.EXPERIENCE_KEYWORDS),
+        ):
+            self._pattern_set.Add(pattern)
+        self._pattern_set.Compile()
+
+        # One Aho-Corasick automaton over all section keywords replaces the
+        # nested any(keyword in line) scans with a single pass per line.
+        # Keyword length is stored alongside the category so matches can be
+        # checked against word boundaries without a second scan
+        self._keyword_automaton = ahocorasick.Automaton()
+        for category, keywords in (
+            ('experience', self.EXPERIENCE_KEYWORDS),
+            ('skills', self.SKILLS_KEYWORDS),
+            ('education', self.EDUCATION_KEYWORDS),
+        ):
+            for keyword in keywords:
+                self._keyword_automaton.add_word(keyword, (len(keyword), category))
+        self._keyword_automaton.make_automaton()
+
+    def _matched_pattern_ids(self, text: str) -> set:
+        """Single DFA scan tagging which extraction patterns occur in text"""
+        return set(self._pattern_set.Match(text) or ())
+
+    def _categories_by_line(self, text: str, lines: List[str]) -> List[set]:
+        """Keyword categories per line from one automaton pass over the text.
+
+        A single O(n + matches) Aho-Corasick scan replaces running the
+        automaton per line; match offsets are bucketed back onto lines via
+        a bisect over the line start positions.
+        """
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        line_categories = [set() for _ in lines]
+        for end_index, (keyword_length, category) in self._keyword_automaton.iter(text):
+            # Equivalent of \b...\b: drop hits embedded in longer words, so
+            # e.g. "experienced" no longer terminates a skills section
+            start_index = end_index - keyword_length + 1
+            if start_index > 0 and text[start_index - 1].isalnum():
+                continue
+            if end_index + 1 < len(text) and text[end_index + 1].isalnum():
+                continue
+            line_index = bisect.bisect_right(line_starts, end_index) - 1
+            line_categories[line_index].add(category)
+        return line_categories
+
+    def extract_contact_info(self, text: str, matched_ids: Optional[set] = None) -> Dict:
         """Extract contact information from text"""
         contact_info = {}
-        
+        if matched_ids is None:
+            matched_ids = self._matched_pattern_ids(text)
+
         # Extract email
-        emails = self.email_pattern.findall(text)
-        if emails:
-            contact_info['email'] = emails[0]
-        
+        if self.EMAIL_ID in matched_ids:
+            emails = self.email_pattern.findall(text)
+            if emails:
+                contact_info['email'] = emails[0]
+
         # Extract phone numbers
-        phones = self.phone_pattern.findall(text)
-        if phones:
-            contact_info['phone'] = phones[0]
-        
+        if self.PHONE_ID in matched_ids:
+            phones = self.phone_pattern.findall(text)
+            if phones:
+                contact_info['phone'] = phones[0]
+
         return contact_info
-    
-    def extract_personal_info(self, text: str) -> Dict:
+
+    def extract_personal_info(self, text: str, matched_ids: Optional[set] = None,
+                              lines: Optional[List[str]] = None) -> Dict:
         """Extract personal information from text"""
-        lines = text.split('\n')
+        if lines is None:
+            # Only the first five lines are inspected; don't split the rest
+            lines = text.split('\n', 5)[:5]
         personal_info = {}
+        if matched_ids is None:
+            matched_ids = self._matched_pattern_ids(text)
         
         # Try to extract name (usually in the first few lines)
         for line in lines[:5]:
             line = line.strip()
             if line and len(line.split()) >= 2 and len(line) < 50:
                 # Simple heuristic: if it looks like a name
-                if not any(char.isdigit() for char in line) and '@' not in line:
+                if not self._digit_re.search(line) and '@' not in line:
                     personal_info['full_name'] = line
                     break
         
         # Extract dates (potential birth dates)
-        dates = self.date_pattern.findall(text)
-        if dates:
-            personal_info['dates_found'] = dates
-        
+        if self.DATE_ID in matched_ids:
+            dates = self.date_pattern.findall(text)
+            if dates:
+                personal_info['dates_found'] = dates
+
         return personal_info
-    
-    def extract_professional_info(self, text: str) -> Dict:
+
+    def extract_professional_info(self, text: str, text_lower: Optional[str] = None,
+                                  lines_lower: Optional[List[str]] = None,
+                                  matched_ids: Optional[set] = None) -> Dict:
         """Extract professional information from text"""
         professional_info = {}
-        
-        # Common keywords for experience
-        experience_keywords = ['experience', 'years', 'worked', 'employment', 'career']
-        skills_keywords = ['skills', 'technologies', 'programming', 'software', 'tools']
-        education_keywords = ['education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd']
-        
-        lines = text.lower().split('\n')
-        
+
+        # The set sweep already knows whether any section heading exists;
+        # without one there is nothing to extract below
+        if matched_ids is None:
+            matched_ids = self._matched_pattern_ids(text)
+        if not matched_ids & {self.SKILLS_ID, self.EDUCATION_ID}:
+            return professional_info
+
+        if text_lower is None:
+            text_lower = text.lower()
+        lines = lines_lower if lines_lower is not None else text_lower.splitlines()
+        # One automaton pass over the whole text; the loops below read tags
+        line_categories = self._categories_by_line(text_lower, lines)
+
         # Extract skills section
         skills = []
         in_skills_section = False
-        for line in lines:
-            if any(keyword in line for keyword in skills_keywords):
+        for line, categories in zip(lines, line_categories):
+            if 'skills' in categories:
                 in_skills_section = True
                 continue
             if in_skills_section and line.strip():
-                if any(keyword in line for keyword in education_keywords + experience_keywords):
+                if 'education' in categories or 'experience' in categories:
                     break
                 skills.append(line.strip())
-        
+
         if skills:
             professional_info['skills'] = ', '.join(skills[:10])  # Limit to first 10 skills
-        
+
         # Extract education information
         education = []
         in_education_section = False
-        for line in lines:
-            if any(keyword in line for keyword in education_keywords):
+        for line, categories in zip(lines, line_categories):
+            if 'education' in categories:
                 in_education_section = True
                 education.append(line.strip())
                 continue
             if in_education_section and line.strip():
-                if any(keyword in line for keyword in skills_keywords + ['experience']):
+                if 'skills' in categories or 'experience' in line:
                     break
                 education.append(line.strip())
-        
+
         if education:
             professional_info['education'] = '\n'.join(education[:5])  # Limit to first 5 lines
-        
+
         return professional_info
-    
+
     def extract_structured_data(self, text: str) -> Dict:
         """Extract all structured data from text"""
         extracted_data = {}
-        
+
+        # One linear scan decides which patterns are worth extracting at all
+        matched_ids = self._matched_pattern_ids(text)
+
+        # Split and lowercase once; the helpers reuse these instead of each
+        # re-walking the multi-KB string
+        lines = text.splitlines()
+        text_lower = text.lower()
+        lines_lower = text_lower.splitlines()
+
         # Extract different types of information
-        contact_info = self.extract_contact_info(text)
-        personal_info = self.extract_personal_info(text)
-        professional_info = self.extract_professional_info(text)
+        contact_info = self.extract_contact_info(text, matched_ids)
+        personal_info = self.extract_personal_info(text, matched_ids, lines=lines)
+        professional_info = self.extract_professional_info(
+            text, text_lower=text_lower, lines_lower=lines_lower, matched_ids=matched_ids
+        )
         
         # Combine all extracted data
         extracted_data.update(contact_info)
@@ -230,7 +594,23 @@ class DataExtractionService:
 
 class CVGenerationService:
     """Service for generating CVs and application forms"""
-    
+
+    # getSampleStyleSheet() costs tens of ms; build it once per process.
+    # The colors and the table style below are likewise pure constants
+    STYLES = getSampleStyleSheet()
+    TITLE_COLOR = colors.HexColor('#2C3E50')
+    HEADING_COLOR = colors.HexColor('#34495E')
+    FORM_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
     def __init__(self):
         self.templates = {
             'modern': self._generate_modern_cv,
@@ -244,43 +624,67 @@ class CVGenerationService:
         """Generate CV PDF from extracted data"""
         if template_type not in self.templates:
             template_type = 'modern'
-        
+
         return self.templates[template_type](extracted_data)
-    
+
+    # Fixed layout constants for the direct-canvas templates
+    PAGE_WIDTH, PAGE_HEIGHT = A4
+    MARGIN = 72
+    TITLE_Y = PAGE_HEIGHT - MARGIN
+    CONTACT_Y = TITLE_Y - 40
+    BODY_TOP_Y = CONTACT_Y - 30
+
+    def _draw_section(self, pdf_canvas, styles, title: str, body: str, y: float) -> float:
+        """Draw one heading + wrapped body block, returning the next y.
+
+        Bodies that do not fit on the current page are split with
+        Paragraph.split() and flowed onto fresh pages, matching the
+        pagination of the old Platypus layout.
+        """
+        if y < self.MARGIN + 60:
+            pdf_canvas.showPage()
+            y = self.PAGE_HEIGHT - self.MARGIN
+
+        pdf_canvas.setFillColor(self.HEADING_COLOR)
+        pdf_canvas.setFont('Helvetica-Bold', 16)
+        pdf_canvas.drawString(self.MARGIN, y, title)
+        y -= 20
+
+        # Paragraph only for the variable-length body: wrap/split calls, no
+        # document-level layout engine involved
+        width = self.PAGE_WIDTH - 2 * self.MARGIN
+        paragraph = Paragraph(body.replace('\n', '<br/>'), styles['Normal'])
+        while True:
+            available = y - self.MARGIN
+            _, height = paragraph.wrap(width, available)
+            if height <= available:
+                paragraph.drawOn(pdf_canvas, self.MARGIN, y - height)
+                return y - height - 16
+
+            # Overflow: draw the lines that fit, carry the rest forward
+            parts = paragraph.split(width, available)
+            if len(parts) == 2:
+                head, paragraph = parts
+                _, head_height = head.wrap(width, available)
+                head.drawOn(pdf_canvas, self.MARGIN, y - head_height)
+            pdf_canvas.showPage()
+            y = self.PAGE_HEIGHT - self.MARGIN
+
     def _generate_modern_cv(self, data: ExtractedData) -> bytes:
         """Generate modern style CV"""
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2C3E50'),
-            alignment=1  # Center alignment
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#34495E'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#BDC3C7'),
-            borderPadding=5
-        )
-        
-        # Build content
-        story = []
-        
+
+        # The template layout is fixed, so draw straight onto a canvas with
+        # precomputed positions instead of running the Platypus paginator
+        pdf_canvas = canvas.Canvas(buffer, pagesize=A4)
+        styles = self.STYLES
+
         # Header
         if data.full_name:
-            story.append(Paragraph(data.full_name, title_style))
-        
+            pdf_canvas.setFillColor(self.TITLE_COLOR)
+            pdf_canvas.setFont('Helvetica-Bold', 24)
+            pdf_canvas.drawCentredString(self.PAGE_WIDTH / 2, self.TITLE_Y, data.full_name)
+
         # Contact Information
         contact_info = []
         if data.email:
@@ -289,40 +693,37 @@ class CVGenerationService:
             contact_info.append(f"Phone: {data.phone}")
         if data.address:
             contact_info.append(f"Address: {data.address}")
-        
+
         if contact_info:
-            story.append(Paragraph(" | ".join(contact_info), styles['Normal']))
-            story.append(Spacer(1, 20))
-        
+            pdf_canvas.setFillColor(colors.black)
+            pdf_canvas.setFont('Helvetica', 10)
+            pdf_canvas.drawCentredString(self.PAGE_WIDTH / 2, self.CONTACT_Y, " | ".join(contact_info))
+
+        y = self.BODY_TOP_Y
+
         # Professional Summary
         if data.current_position or data.company:
-            story.append(Paragraph("Professional Summary", heading_style))
-            summary_text = f"{data.current_position or 'Professional'}"
+            summary_parts = [data.current_position or 'Professional']
             if data.company:
-                summary_text += f" at {data.company}"
+                summary_parts.append(f"at {data.company}")
             if data.experience_years:
-                summary_text += f" with {data.experience_years} years of experience"
-            story.append(Paragraph(summary_text, styles['Normal']))
-            story.append(Spacer(1, 12))
-        
+                summary_parts.append(f"with {data.experience_years} years of experience")
+            y = self._draw_section(pdf_canvas, styles, "Professional Summary", ' '.join(summary_parts), y)
+
         # Skills
         if data.skills:
-            story.append(Paragraph("Skills", heading_style))
-            story.append(Paragraph(data.skills, styles['Normal']))
-            story.append(Spacer(1, 12))
-        
+            y = self._draw_section(pdf_canvas, styles, "Skills", data.skills, y)
+
         # Education
         if data.education:
-            story.append(Paragraph("Education", heading_style))
-            story.append(Paragraph(data.education, styles['Normal']))
-            story.append(Spacer(1, 12))
-        
+            y = self._draw_section(pdf_canvas, styles, "Education", data.education, y)
+
         # Certifications
         if data.certifications:
-            story.append(Paragraph("Certifications", heading_style))
-            story.append(Paragraph(data.certifications, styles['Normal']))
-        
-        doc.build(story)
+            self._draw_section(pdf_canvas, styles, "Certifications", data.certifications, y)
+
+        pdf_canvas.showPage()
+        pdf_canvas.save()
         buffer.seek(0)
         return buffer.getvalue()
     
@@ -347,8 +748,8 @@ class CVGenerationService:
         """Generate application form PDF"""
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
-        
-        styles = getSampleStyleSheet()
+
+        styles = self.STYLES
         story = []
         
         # Title
@@ -368,16 +769,7 @@ class CVGenerationService:
         ]
         
         table = Table(form_data, colWidths=[2*inch, 4*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(self.FORM_TABLE_STYLE)
         
         story.append(table)
         doc.build(story)
@@ -386,31 +778,29 @@ class CVGenerationService:
     
     def merge_documents(self, cv_path: str, application_form_path: str, original_doc_path: str) -> bytes:
         """Merge CV, application form, and original document into single PDF"""
-        writer = PdfWriter()
-        
+        # insert_pdf appends the source streams in place instead of
+        # deep-copying every page object the way a PdfWriter does
+        merged = fitz.open()
+
         # Add CV
         if os.path.exists(cv_path):
-            cv_reader = PdfReader(cv_path)
-            for page in cv_reader.pages:
-                writer.add_page(page)
-        
+            with fitz.open(cv_path) as cv_doc:
+                merged.insert_pdf(cv_doc)
+
         # Add application form
         if os.path.exists(application_form_path):
-            app_reader = PdfReader(application_form_path)
-            for page in app_reader.pages:
-                writer.add_page(page)
-        
-        # Add original document (if PDF)
-        if os.path.exists(original_doc_path) and original_doc_path.endswith('.pdf'):
-            orig_reader = PdfReader(original_doc_path)
-            for page in orig_reader.pages:
-                writer.add_page(page)
-        
-        # Write to buffer
-        buffer = io.BytesIO()
-        writer.write(buffer)
-        buffer.seek(0)
-        return buffer.getvalue()
+            with fitz.open(application_form_path) as app_doc:
+                merged.insert_pdf(app_doc)
+
+        # Add original document (if PDF; splitext catches uppercase names)
+        if os.path.exists(original_doc_path) and os.path.splitext(original_doc_path)[1].lower() == '.pdf':
+            with fitz.open(original_doc_path) as original_doc:
+                merged.insert_pdf(original_doc)
+
+        # garbage=4 + deflate dedupes and compresses the combined streams
+        output = merged.tobytes(garbage=4, deflate=True)
+        merged.close()
+        return output
 
 class DocumentProcessingService:
     """Main service for coordinating document processing"""
@@ -419,7 +809,16 @@ class DocumentProcessingService:
         self.ocr_service = OCRService()
         self.extraction_service = DataExtractionService()
         self.cv_service = CVGenerationService()
-    
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """blake2b-128 of a file, streamed so large uploads stay off-heap"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as file_handle:
+            for chunk in iter(lambda: file_handle.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     def process_document(self, document_scan: DocumentScan) -> bool:
         """Process a document scan through the complete pipeline"""
         try:
@@ -428,10 +827,25 @@ class DocumentProcessingService:
             document_scan.save()
             
             start_time = time.time()
-            
-            # Extract text from document
+
             document_path = document_scan.original_document.path
-            text, confidence, page_count = self.ocr_service.extract_text_from_document(document_path)
+            document_scan.content_hash = self._hash_file(document_path)
+
+            # Identical bytes produce identical OCR output, so a completed
+            # scan of the same file lets us skip the whole OCR pipeline
+            # (common for re-uploads and retries after failure)
+            cached_scan = DocumentScan.objects.filter(
+                content_hash=document_scan.content_hash,
+                scan_status='completed',
+            ).exclude(pk=document_scan.pk).first()
+
+            if cached_scan is not None:
+                text = cached_scan.extracted_text or ''
+                confidence = cached_scan.confidence_score
+                page_count = cached_scan.page_count
+            else:
+                # Extract text from document
+                text, confidence, page_count = self.ocr_service.extract_text_from_document(document_path)
             
             # Update document scan with results
             document_scan.extracted_text = text
@@ -440,17 +854,24 @@ class DocumentProcessingService:
             document_scan.processing_time = time.time() - start_time
             document_scan.scan_status = 'completed'
             document_scan.save()
-            
+
+            # Refresh the full-text search vector from the new OCR text
+            # (built from the in-memory text since the column stores zstd bytes)
+            DocumentScan.objects.filter(pk=document_scan.pk).update(
+                search_vector=SearchVector(Value(text or ''))
+            )
+
             # Extract structured data
             structured_data = self.extraction_service.extract_structured_data(text)
             
-            # Create or update ExtractedData
-            extracted_data, created = ExtractedData.objects.get_or_create(
-                document_scan=document_scan,
-                defaults=structured_data
-            )
-            
-            if not created:
+            # Create or update ExtractedData; from_dict validates the whole
+            # payload in one compiled pass before touching the model
+            extracted_data = ExtractedData.objects.filter(
+                document_scan=document_scan
+            ).first()
+            if extracted_data is None:
+                ExtractedData.from_dict(document_scan, structured_data).save()
+            else:
                 # Update existing data
                 for key, value in structured_data.items():
                     if hasattr(extracted_data, key) and value:
@@ -475,13 +896,22 @@ class DocumentProcessingService:
             # Get extracted data
             extracted_data = generated_cv.source_document.extracted_data
             
-            # Generate CV
-            cv_pdf = self.cv_service.generate_cv(extracted_data, generated_cv.template_type)
+            # Build the CV and the application form concurrently: ReportLab
+            # spends much of its time in zlib compression, which releases the
+            # GIL, so the two documents overlap well on threads
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                cv_future = executor.submit(
+                    self.cv_service.generate_cv, extracted_data, generated_cv.template_type
+                )
+                form_future = executor.submit(
+                    self.cv_service.generate_application_form, extracted_data
+                )
+                cv_pdf = cv_future.result()
+                app_form_pdf = form_future.result()
+
             cv_filename = f"cv_{generated_cv.id}.pdf"
             generated_cv.cv_file.save(cv_filename, ContentFile(cv_pdf))
-            
-            # Generate application form
-            app_form_pdf = self.cv_service.generate_application_form(extracted_data)
+
             app_filename = f"application_{generated_cv.id}.pdf"
             generated_cv.application_form.save(app_filename, ContentFile(app_form_pdf))
             
@@ -1,24 +1,76 @@
-from celery import shared_task
+from celery import chord, shared_task
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.core.mail import send_mail
 from django.conf import settings
+import json
 import logging
 import time
 
-from .models import DocumentScan, GeneratedCV, DocumentProcessingJob
+from .models import (
+    DocumentScan, ExtractedData, GeneratedCV,
+    DocumentFeedback, DocumentProcessingJob
+)
 from .services import DocumentProcessingService
 from core.models import Notification
 
 logger = logging.getLogger(__name__)
 
+def _finalize_job(job):
+    """Write a job's terminal state with one filtered UPDATE.
+
+    Progress ticks live in the cache, so this is the only job write a task
+    issues after creation; the queryset UPDATE touches just the result
+    columns and skips model-save signal machinery.
+    """
+    DocumentProcessingJob.objects.filter(pk=job.pk).update(
+        status=job.status,
+        progress_percentage=job.progress_percentage,
+        completed_at=job.completed_at,
+        result_data=job.result_data,
+        error_details=job.error_details,
+    )
+
+# One service per worker process: its OCR engine, regex/automaton state and
+# PDF styles are expensive to build and safe to reuse across tasks
+_service = None
+
+def _svc():
+    global _service
+    if _service is None:
+        _service = DocumentProcessingService()
+    return _service
+
+# Lazy per-worker Redis connection for job-state pub/sub
+_redis = None
+
+def _publish_event(channel, payload):
+    """Push a job-state event to Redis pub/sub so SSE clients see transitions
+    without polling. Events are best-effort: the status endpoints remain the
+    source of truth, so a missing Redis just degrades back to polling."""
+    global _redis
+    try:
+        if _redis is None:
+            import redis
+            _redis = redis.Redis.from_url(settings.REDIS_URL)
+        _redis.publish(channel, json.dumps(payload))
+    except Exception as e:
+        logger.warning(f"Could not publish event on {channel}: {str(e)}")
+
 @shared_task(bind=True)
 def process_document_async(self, document_scan_id):
     """Asynchronously process a document scan"""
     try:
         # Get document scan
         document_scan = DocumentScan.objects.get(id=document_scan_id)
-        
+
+        # Redelivered after a worker crash? The work already happened.
+        if document_scan.scan_status == 'completed':
+            logger.info(f"Document scan {document_scan_id} already completed, skipping")
+            return True
+
         # Create processing job
         job = DocumentProcessingJob.objects.create(
             user=document_scan.user,
@@ -28,19 +80,11 @@ def process_document_async(self, document_scan_id):
             started_at=timezone.now()
         )
         
-        # Update progress
-        job.progress_percentage = 10
-        job.save()
-        
-        # Initialize processing service
-        processing_service = DocumentProcessingService()
-        
-        # Update progress
-        job.progress_percentage = 30
-        job.save()
-        
-        # Process the document
-        success = processing_service.process_document(document_scan)
+        # Update progress (cache only; no DB write per tick)
+        job.set_progress(10)
+
+        # Process the document with the per-worker service instance
+        success = _svc().process_document(document_scan)
         
         if success:
             job.status = 'completed'
@@ -62,7 +106,7 @@ def process_document_async(self, document_scan_id):
             
             # Send email notification if enabled
             if hasattr(settings, 'SEND_EMAIL_NOTIFICATIONS') and settings.SEND_EMAIL_NOTIFICATIONS:
-                send_processing_complete_email(document_scan.user, document_scan)
+                send_processing_complete_email.delay(document_scan.user_id, document_scan.id)
                 
         else:
             job.status = 'failed'
@@ -76,10 +120,17 @@ def process_document_async(self, document_scan_id):
                 message=f'Failed to process document "{document_scan.original_document.name}". Please try again.',
                 notification_type='error'
             )
-        
-        job.save()
+
+        _finalize_job(job)
+        job.clear_progress()
+        # Let the next status poll see the terminal state immediately
+        cache.delete(f'procstat:{document_scan_id}')
+        _publish_event(f'doc:{document_scan_id}', {
+            'status': job.status,
+            'progress': job.progress_percentage,
+        })
         return success
-        
+
     except DocumentScan.DoesNotExist:
         logger.error(f"Document scan {document_scan_id} not found")
         return False
@@ -91,10 +142,12 @@ def process_document_async(self, document_scan_id):
             job.status = 'failed'
             job.error_details = str(e)
             job.completed_at = timezone.now()
-            job.save()
+            _finalize_job(job)
         except:
             pass
-        
+
+        cache.delete(f'procstat:{document_scan_id}')
+        _publish_event(f'doc:{document_scan_id}', {'status': 'failed', 'progress': 0})
         return False
 
 @shared_task(bind=True)
@@ -103,7 +156,12 @@ def generate_cv_async(self, generated_cv_id):
     try:
         # Get generated CV object
         generated_cv = GeneratedCV.objects.get(id=generated_cv_id)
-        
+
+        # Redelivered after a worker crash? The work already happened.
+        if generated_cv.generation_status == 'completed':
+            logger.info(f"Generated CV {generated_cv_id} already completed, skipping")
+            return True
+
         # Create processing job
         job = DocumentProcessingJob.objects.create(
             user=generated_cv.user,
@@ -113,19 +171,11 @@ def generate_cv_async(self, generated_cv_id):
             started_at=timezone.now()
         )
         
-        # Update progress
-        job.progress_percentage = 20
-        job.save()
-        
-        # Initialize processing service
-        processing_service = DocumentProcessingService()
-        
-        # Update progress
-        job.progress_percentage = 50
-        job.save()
-        
-        # Generate CV and forms
-        success = processing_service.generate_cv_and_forms(generated_cv)
+        # Update progress (cache only; no DB write per tick)
+        job.set_progress(20)
+
+        # Generate CV and forms with the per-worker service instance
+        success = _svc().generate_cv_and_forms(generated_cv)
         
         if success:
             job.status = 'completed'
@@ -148,7 +198,7 @@ def generate_cv_async(self, generated_cv_id):
             
             # Send email notification if enabled
             if hasattr(settings, 'SEND_EMAIL_NOTIFICATIONS') and settings.SEND_EMAIL_NOTIFICATIONS:
-                send_cv_complete_email(generated_cv.user, generated_cv)
+                send_cv_complete_email.delay(generated_cv.user_id, generated_cv.id)
                 
         else:
             job.status = 'failed'
@@ -162,10 +212,17 @@ def generate_cv_async(self, generated_cv_id):
                 message='Failed to generate your CV. Please try again or contact support.',
                 notification_type='error'
             )
-        
-        job.save()
+
+        _finalize_job(job)
+        job.clear_progress()
+        # Let the next status poll see the terminal state immediately
+        cache.delete(f'cvstat:{generated_cv_id}')
+        _publish_event(f'cv:{generated_cv_id}', {
+            'status': job.status,
+            'progress': job.progress_percentage,
+        })
         return success
-        
+
     except GeneratedCV.DoesNotExist:
         logger.error(f"Generated CV {generated_cv_id} not found")
         return False
@@ -177,47 +234,76 @@ def generate_cv_async(self, generated_cv_id):
             job.status = 'failed'
             job.error_details = str(e)
             job.completed_at = timezone.now()
-            job.save()
+            _finalize_job(job)
         except:
             pass
-        
+
+        cache.delete(f'cvstat:{generated_cv_id}')
+        _publish_event(f'cv:{generated_cv_id}', {'status': 'failed', 'progress': 0})
         return False
 
+def _delete_stored_file(name):
+    """Unlink a file from storage, logging rather than raising on failure"""
+    try:
+        default_storage.delete(name)
+    except Exception as e:
+        logger.error(f"Error deleting file {name}: {str(e)}")
+
+def _raw_delete_in_chunks(queryset, chunk_size=1000):
+    """Delete a queryset in bounded id batches, bypassing cascade collection.
+
+    _raw_delete skips Django's signal/cascade machinery, so callers must
+    delete child rows before their parents. Chunking keeps each DELETE
+    within statement timeouts regardless of backlog size.
+    """
+    deleted = 0
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        batch = queryset.model.objects.filter(id__in=ids)
+        deleted += batch._raw_delete(batch.db)
+
 @shared_task
 def cleanup_old_documents():
     """Clean up old documents and files"""
     try:
         # Delete documents older than 90 days (configurable)
         cutoff_date = timezone.now() - timezone.timedelta(days=90)
-        
+
         old_documents = DocumentScan.objects.filter(created_at__lt=cutoff_date)
-        deleted_count = 0
-        
-        for document in old_documents:
-            try:
-                # Delete associated files
-                if document.original_document:
-                    document.original_document.delete()
-                
-                # Delete generated CVs and their files
-                for cv in document.generated_cvs.all():
-                    if cv.cv_file:
-                        cv.cv_file.delete()
-                    if cv.application_form:
-                        cv.application_form.delete()
-                    if cv.merged_document:
-                        cv.merged_document.delete()
-                    cv.delete()
-                
-                document.delete()
-                deleted_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error deleting document {document.id}: {str(e)}")
-        
+        old_cvs = GeneratedCV.objects.filter(
+            source_document__created_at__lt=cutoff_date
+        )
+
+        # Pass 1: unlink storage files, streaming names instead of model rows
+        for name in old_documents.exclude(original_document='').values_list(
+                'original_document', flat=True).iterator(chunk_size=500):
+            _delete_stored_file(name)
+
+        for file_names in old_cvs.values_list(
+                'cv_file', 'application_form', 'merged_document'
+        ).iterator(chunk_size=500):
+            for name in file_names:
+                if name:
+                    _delete_stored_file(name)
+
+        # Pass 2: raw deletes in dependency order (children before parents)
+        # since _raw_delete does not cascade
+        _raw_delete_in_chunks(DocumentProcessingJob.objects.filter(
+            document_scan__created_at__lt=cutoff_date))
+        _raw_delete_in_chunks(DocumentProcessingJob.objects.filter(
+            generated_cv__source_document__created_at__lt=cutoff_date))
+        _raw_delete_in_chunks(DocumentFeedback.objects.filter(
+            document_scan__created_at__lt=cutoff_date))
+        _raw_delete_in_chunks(ExtractedData.objects.filter(
+            document_scan__created_at__lt=cutoff_date))
+        _raw_delete_in_chunks(old_cvs)
+        deleted_count = _raw_delete_in_chunks(old_documents)
+
         logger.info(f"Cleaned up {deleted_count} old documents")
         return deleted_count
-        
+
     except Exception as e:
         logger.error(f"Error in cleanup task: {str(e)}")
         return 0
@@ -229,14 +315,13 @@ def cleanup_failed_jobs():
         # Delete failed jobs older than 30 days
         cutoff_date = timezone.now() - timezone.timedelta(days=30)
         
-        old_jobs = DocumentProcessingJob.objects.filter(
+        # Jobs have no dependents, so chunked raw deletes are safe here and
+        # avoid the separate count() scan over the same predicate
+        deleted_count = _raw_delete_in_chunks(DocumentProcessingJob.objects.filter(
             status='failed',
             created_at__lt=cutoff_date
-        )
-        
-        deleted_count = old_jobs.count()
-        old_jobs.delete()
-        
+        ))
+
         logger.info(f"Cleaned up {deleted_count} old failed jobs")
         return deleted_count
         
@@ -249,41 +334,37 @@ def generate_processing_report():
     """Generate daily processing report for admins"""
     try:
         from datetime import datetime, timedelta
-        
+
+        from django.db.models import Avg, Count, Q
+
         # Get yesterday's data
         yesterday = timezone.now() - timedelta(days=1)
         start_date = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
         end_date = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
-        
-        # Calculate statistics
-        total_documents = DocumentScan.objects.filter(
+
+        # Calculate statistics with one conditional aggregate per table, so
+        # each date-range index is scanned once instead of per metric
+        scan_stats = DocumentScan.objects.filter(
             created_at__range=[start_date, end_date]
-        ).count()
-        
-        successful_scans = DocumentScan.objects.filter(
-            created_at__range=[start_date, end_date],
-            scan_status='completed'
-        ).count()
-        
-        failed_scans = DocumentScan.objects.filter(
-            created_at__range=[start_date, end_date],
-            scan_status='failed'
-        ).count()
-        
-        generated_cvs = GeneratedCV.objects.filter(
+        ).aggregate(
+            total=Count('id'),
+            successful=Count('id', filter=Q(scan_status='completed')),
+            failed=Count('id', filter=Q(scan_status='failed')),
+            avg_time=Avg('processing_time', filter=Q(scan_status='completed'))
+        )
+        cv_stats = GeneratedCV.objects.filter(
             created_at__range=[start_date, end_date]
-        ).count()
-        
-        successful_cvs = GeneratedCV.objects.filter(
-            created_at__range=[start_date, end_date],
-            generation_status='completed'
-        ).count()
-        
-        # Calculate average processing time
-        avg_processing_time = DocumentScan.objects.filter(
-            created_at__range=[start_date, end_date],
-            scan_status='completed'
-        ).aggregate(avg_time=models.Avg('processing_time'))['avg_time'] or 0
+        ).aggregate(
+            total=Count('id'),
+            successful=Count('id', filter=Q(generation_status='completed'))
+        )
+
+        total_documents = scan_stats['total']
+        successful_scans = scan_stats['successful']
+        failed_scans = scan_stats['failed']
+        generated_cvs = cv_stats['total']
+        successful_cvs = cv_stats['successful']
+        avg_processing_time = scan_stats['avg_time'] or 0
         
         # Create report data
         report_data = {
@@ -298,18 +379,28 @@ def generate_processing_report():
             'avg_processing_time': round(avg_processing_time, 2)
         }
         
-        # Send report to admins
+        # Send report to admins in a single INSERT; only the FK is needed
         admin_users = User.objects.filter(
             userprofile__role__in=['Super Admin', 'Admin']
+        ).only('id')
+
+        report_message = (
+            f"Documents processed: {total_documents} "
+            f"(Success: {successful_scans}, Failed: {failed_scans}). "
+            f"CVs generated: {generated_cvs}."
+        )
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=admin,
+                    title='Daily Processing Report',
+                    message=report_message,
+                    notification_type='info'
+                )
+                for admin in admin_users.iterator(chunk_size=500)
+            ],
+            batch_size=500
         )
-        
-        for admin in admin_users:
-            Notification.objects.create(
-                user=admin,
-                title='Daily Processing Report',
-                message=f"Documents processed: {total_documents} (Success: {successful_scans}, Failed: {failed_scans}). CVs generated: {generated_cvs}.",
-                notification_type='info'
-            )
         
         logger.info(f"Generated processing report for {yesterday.strftime('%Y-%m-%d')}")
         return report_data
@@ -322,51 +413,64 @@ def generate_processing_report():
 def batch_reprocess_documents(document_ids, user_id):
     """Batch reprocess multiple documents"""
     try:
-        user = User.objects.get(id=user_id)
-        documents = DocumentScan.objects.filter(id__in=document_ids, user=user)
-        
-        processed_count = 0
-        failed_count = 0
-        
-        for document in documents:
-            try:
-                # Reset document status
-                document.scan_status = 'pending'
-                document.extracted_text = ''
-                document.confidence_score = 0.0
-                document.error_message = ''
-                document.save()
-                
-                # Process document
-                processing_service = DocumentProcessingService()
-                success = processing_service.process_document(document)
-                
-                if success:
-                    processed_count += 1
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
-                logger.error(f"Error reprocessing document {document.id}: {str(e)}")
-                failed_count += 1
-        
-        # Create notification
-        Notification.objects.create(
-            user=user,
-            title='Batch Reprocessing Complete',
-            message=f'Reprocessed {processed_count} documents successfully. {failed_count} failed.',
-            notification_type='info' if failed_count == 0 else 'warning'
+        # Filter on the raw FK; nothing here needs the User row itself
+        ids = list(DocumentScan.objects.filter(
+            id__in=document_ids, user_id=user_id
+        ).values_list('id', flat=True))
+
+        # Reset state in one UPDATE; update() bypasses the extracted_text
+        # property, so clear the compressed column directly
+        DocumentScan.objects.filter(id__in=ids).update(
+            scan_status='pending',
+            extracted_text_zstd=None,
+            confidence_score=0.0,
+            error_message=''
         )
-        
-        return {'processed': processed_count, 'failed': failed_count}
-        
+
+        if not ids:
+            return {'dispatched': 0}
+
+        # Fan out one sub-task per document so the worker pool processes the
+        # batch concurrently. The chord callback does the counting and
+        # notification, so no worker sits blocked waiting on sub-tasks that
+        # share its queue.
+        chord(
+            (process_document_async.s(doc_id) for doc_id in ids),
+            finalize_batch_reprocess.s(user_id)
+        ).apply_async()
+
+        return {'dispatched': len(ids)}
+
     except Exception as e:
         logger.error(f"Error in batch reprocessing: {str(e)}")
         return {'processed': 0, 'failed': len(document_ids)}
 
-def send_processing_complete_email(user, document_scan):
-    """Send email notification when document processing is complete"""
+@shared_task
+def finalize_batch_reprocess(outcomes, user_id):
+    """Chord callback: tally sub-task results and notify the requester"""
+    processed_count = sum(1 for outcome in outcomes if outcome is True)
+    failed_count = len(outcomes) - processed_count
+
+    Notification.objects.create(
+        recipient_id=user_id,
+        title='Batch Reprocessing Complete',
+        message=f'Reprocessed {processed_count} documents successfully. {failed_count} failed.',
+        notification_type='info' if failed_count == 0 else 'warning'
+    )
+
+    return {'processed': processed_count, 'failed': failed_count}
+
+@shared_task(queue='email', rate_limit='60/m')
+def send_processing_complete_email(user_id, document_scan_id):
+    """Send email notification when document processing is complete.
+
+    Runs on the email queue so SMTP latency never blocks a processing
+    worker; rate-limited to stay inside typical provider quotas.
+    """
     try:
+        user = User.objects.get(id=user_id)
+        document_scan = DocumentScan.objects.get(id=document_scan_id)
+
         subject = 'Document Processing Complete'
         message = f"""
         Hello {user.get_full_name() or user.username},
@@ -395,9 +499,13 @@ def send_processing_complete_email(user, document_scan):
     except Exception as e:
         logger.error(f"Error sending processing complete email: {str(e)}")
 
-def send_cv_complete_email(user, generated_cv):
+@shared_task(queue='email', rate_limit='60/m')
+def send_cv_complete_email(user_id, generated_cv_id):
     """Send email notification when CV generation is complete"""
     try:
+        user = User.objects.get(id=user_id)
+        generated_cv = GeneratedCV.objects.get(id=generated_cv_id)
+
         subject = 'CV Generation Complete'
         message = f"""
         Hello {user.get_full_name() or user.username},
@@ -1,41 +1,64 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse, Http404
+from django.http import (
+    JsonResponse, HttpResponse, FileResponse, StreamingHttpResponse, Http404
+)
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from django.conf import settings
 import json
 import os
+import time
 from datetime import datetime, timedelta
 
 from accounts.decorators import role_required
-from .models import DocumentScan, ExtractedData, GeneratedCV, DocumentProcessingJob
+from .models import (
+    MAX_DOCUMENT_UPLOAD_SIZE,
+    DocumentScan, ExtractedData, GeneratedCV, DocumentProcessingJob
+)
 from .forms import DocumentUploadForm, CVGenerationForm, DocumentSearchForm
 from .services import DocumentProcessingService
 from .tasks import process_document_async, generate_cv_async
 
+# Short enough that counters never look stale, long enough to absorb the
+# dashboard's polling traffic
+DASHBOARD_STATS_TTL = 30
+
+def _dashboard_stats(user):
+    """Per-user dashboard counters: one conditional aggregate per model, cached"""
+    def build():
+        stats = DocumentScan.objects.filter(user=user).aggregate(
+            total_documents=Count('id'),
+            completed_scans=Count('id', filter=Q(scan_status='completed')),
+            processing_scans=Count('id', filter=Q(scan_status='processing')),
+            failed_scans=Count('id', filter=Q(scan_status='failed')),
+        )
+        stats['generated_cvs'] = GeneratedCV.objects.filter(user=user).count()
+        stats['active_jobs'] = DocumentProcessingJob.objects.filter(
+            user=user,
+            status__in=['queued', 'processing']
+        ).count()
+        return stats
+
+    return cache.get_or_set(f'dash:{user.id}', build, DASHBOARD_STATS_TTL)
+
 @login_required
 def dashboard(request):
     """Document scanner dashboard"""
     # Get user's recent documents
-    recent_scans = DocumentScan.objects.filter(user=request.user)[:5]
+    recent_scans = DocumentScan.list_objects.filter(user=request.user)[:5]
     recent_cvs = GeneratedCV.objects.filter(user=request.user)[:5]
-    
+
     # Get statistics
-    stats = {
-        'total_documents': DocumentScan.objects.filter(user=request.user).count(),
-        'completed_scans': DocumentScan.objects.filter(user=request.user, scan_status='completed').count(),
-        'generated_cvs': GeneratedCV.objects.filter(user=request.user).count(),
-        'processing_jobs': DocumentProcessingJob.objects.filter(
-            user=request.user, 
-            status__in=['queued', 'processing']
-        ).count(),
-    }
-    
+    stats = dict(_dashboard_stats(request.user))
+    stats['processing_jobs'] = stats['active_jobs']
+
     context = {
         'recent_scans': recent_scans,
         'recent_cvs': recent_cvs,
@@ -48,6 +71,11 @@ def dashboard(request):
 def upload_document(request):
     """Upload and process document"""
     if request.method == 'POST':
+        # Reject oversized requests before Django reads the upload into memory
+        content_length = request.META.get('CONTENT_LENGTH')
+        if content_length and int(content_length) > MAX_DOCUMENT_UPLOAD_SIZE:
+            return HttpResponse('File size cannot exceed 10MB.', status=413)
+
         form = DocumentUploadForm(request.POST, request.FILES)
         if form.is_valid():
             document_scan = form.save(commit=False)
@@ -69,8 +97,9 @@ def upload_document(request):
 def document_list(request):
     """List user's documents with search and filtering"""
     form = DocumentSearchForm(request.GET)
-    documents = DocumentScan.objects.filter(user=request.user)
-    
+    documents = DocumentScan.list_objects.filter(user=request.user)
+    ordering = ('-created_at',)
+
     # Apply filters
     if form.is_valid():
         if form.cleaned_data['document_type']:
@@ -81,11 +110,13 @@ def document_list(request):
         
         if form.cleaned_data['search_query']:
             query = form.cleaned_data['search_query']
+            search_query = SearchQuery(query)
             documents = documents.filter(
-                Q(extracted_text__icontains=query) |
+                Q(search_vector=search_query) |
                 Q(original_document__icontains=query)
-            )
-        
+            ).annotate(rank=SearchRank('search_vector', search_query))
+            ordering = ('-rank', '-created_at')
+
         if form.cleaned_data['date_from']:
             documents = documents.filter(created_at__gte=form.cleaned_data['date_from'])
         
@@ -93,7 +124,7 @@ def document_list(request):
             documents = documents.filter(created_at__lte=form.cleaned_data['date_to'])
     
     # Pagination
-    paginator = Paginator(documents.order_by('-created_at'), 10)
+    paginator = Paginator(documents.order_by(*ordering), 10)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -108,15 +139,20 @@ def document_list(request):
 @login_required
 def document_detail(request, pk):
     """View document details and extracted data"""
-    document = get_object_or_404(DocumentScan, pk=pk, user=request.user)
-    
+    # One query for the document plus its one-to-one extracted data, one for
+    # the prefetched CVs (the default manager already joins user)
+    document = get_object_or_404(
+        DocumentScan.objects.select_related('extracted_data').prefetch_related('generated_cvs'),
+        pk=pk, user=request.user
+    )
+
     try:
         extracted_data = document.extracted_data
     except ExtractedData.DoesNotExist:
         extracted_data = None
     
     generated_cvs = document.generated_cvs.all()
-    processing_jobs = DocumentProcessingJob.objects.filter(document_scan=document)
+    processing_jobs = DocumentProcessingJob.list_objects.filter(document_scan=document)
     
     context = {
         'document': document,
@@ -205,10 +241,13 @@ def download_file(request, file_type, pk):
     if not file_field or not os.path.exists(file_field.path):
         raise Http404("File not found")
     
-    with open(file_field.path, 'rb') as f:
-        response = HttpResponse(f.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(file_field.name)}"'
-        return response
+    # Stream via wsgi.file_wrapper instead of reading the PDF into memory
+    return FileResponse(
+        file_field.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(file_field.name),
+        content_type='application/pdf'
+    )
 
 @login_required
 def download_original(request, pk):
@@ -218,29 +257,34 @@ def download_original(request, pk):
     if not document.original_document or not os.path.exists(document.original_document.path):
         raise Http404("File not found")
     
-    with open(document.original_document.path, 'rb') as f:
-        response = HttpResponse(f.read())
-        response['Content-Disposition'] = f'attachment; filename="{os.path.basename(document.original_document.name)}"'
-        return response
+    # Stream via wsgi.file_wrapper instead of reading the file into memory
+    return FileResponse(
+        document.original_document.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(document.original_document.name)
+    )
 
 @login_required
 @require_http_methods(["POST"])
 def reprocess_document(request, pk):
     """Reprocess a document"""
-    document = get_object_or_404(DocumentScan, pk=pk, user=request.user)
-    
-    # Reset status and start reprocessing
-    document.scan_status = 'pending'
-    document.extracted_text = ''
-    document.confidence_score = 0.0
-    document.error_message = ''
-    document.save()
-    
+    # Reset with one filtered UPDATE: no SELECT, and a concurrent worker's
+    # whole-row save cannot clobber the reset. update() bypasses the
+    # extracted_text property, so clear the compressed column directly.
+    updated = DocumentScan.objects.filter(pk=pk, user=request.user).update(
+        scan_status='pending',
+        extracted_text_zstd=None,
+        confidence_score=0.0,
+        error_message=''
+    )
+    if not updated:
+        raise Http404("No DocumentScan matches the given query.")
+
     # Start background processing
-    process_document_async.delay(document.id)
+    process_document_async.delay(pk)
     
     messages.success(request, 'Document reprocessing started!')
-    return redirect('document_scanner:document_detail', pk=document.pk)
+    return redirect('document_scanner:document_detail', pk=pk)
 
 @login_required
 @require_http_methods(["DELETE"])
@@ -270,76 +314,151 @@ def delete_cv(request, pk):
 
 # API Views for real-time updates
 
+# Status endpoints are polled every few seconds per in-flight job; a TTL
+# shorter than the poll interval absorbs most of that load. The tasks
+# delete these keys on status transitions so terminal states show up
+# immediately.
+STATUS_CACHE_TTL = 3
+
 @login_required
 def api_processing_status(request, pk):
     """Get processing status for a document"""
     document = get_object_or_404(DocumentScan, pk=pk, user=request.user)
-    
+
+    cache_key = f'procstat:{pk}'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return JsonResponse(cached)
+
     # Get latest processing job
     latest_job = DocumentProcessingJob.objects.filter(
         document_scan=document
     ).order_by('-created_at').first()
-    
+
     data = {
         'scan_status': document.scan_status,
         'confidence_score': document.confidence_score,
         'processing_time': document.processing_time,
         'error_message': document.error_message,
         'job_status': latest_job.status if latest_job else None,
-        'progress_percentage': latest_job.progress_percentage if latest_job else 0,
+        'progress_percentage': latest_job.progress if latest_job else 0,
     }
-    
+
+    cache.set(cache_key, data, STATUS_CACHE_TTL)
     return JsonResponse(data)
 
 @login_required
 def api_cv_status(request, pk):
     """Get CV generation status"""
     cv = get_object_or_404(GeneratedCV, pk=pk, user=request.user)
-    
+
+    cache_key = f'cvstat:{pk}'
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return JsonResponse(cached)
+
     # Get latest processing job
     latest_job = DocumentProcessingJob.objects.filter(
         generated_cv=cv
     ).order_by('-created_at').first()
-    
+
     data = {
         'generation_status': cv.generation_status,
         'error_message': cv.error_message,
         'job_status': latest_job.status if latest_job else None,
-        'progress_percentage': latest_job.progress_percentage if latest_job else 0,
+        'progress_percentage': latest_job.progress if latest_job else 0,
         'files_ready': {
             'cv': bool(cv.cv_file),
             'application': bool(cv.application_form),
             'merged': bool(cv.merged_document),
         }
     }
-    
+
+    cache.set(cache_key, data, STATUS_CACHE_TTL)
     return JsonResponse(data)
 
+# Keep-alive cadence for SSE streams; writing the comment surfaces broken
+# pipes so abandoned streams unwind instead of pinning a worker thread
+SSE_HEARTBEAT_SECONDS = 15
+# Jobs never legitimately run this long; close lingering streams after it
+SSE_MAX_LIFETIME_SECONDS = 600
+
+def _sse_event_stream(channel, current):
+    """Relay Redis pub/sub messages on channel as server-sent events.
+
+    current is a status snapshot taken before subscribing: a job that
+    already finished gets one terminal event and an immediate close, since
+    nothing will ever publish on its channel again.
+    """
+    yield f'data: {json.dumps(current)}\n\n'
+    if current['status'] in ('completed', 'failed'):
+        return
+
+    import redis
+
+    conn = redis.Redis.from_url(settings.REDIS_URL)
+    pubsub = conn.pubsub()
+    pubsub.subscribe(channel)
+    deadline = time.monotonic() + SSE_MAX_LIFETIME_SECONDS
+    try:
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=SSE_HEARTBEAT_SECONDS)
+            if message is None:
+                yield ': keep-alive\n\n'
+                continue
+            if message['type'] != 'message':
+                continue
+            payload = message['data'].decode()
+            yield f'data: {payload}\n\n'
+            # Tasks publish a terminal event last, so the stream can close
+            if '"completed"' in payload or '"failed"' in payload:
+                return
+    finally:
+        pubsub.close()
+        conn.close()
+
+def _sse_response(channel, current):
+    response = StreamingHttpResponse(
+        _sse_event_stream(channel, current),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+@login_required
+def api_processing_events(request, pk):
+    """Stream processing-state events for a document over SSE.
+
+    Replaces the polling loop against api_processing_status: the tasks
+    publish transitions to Redis and this view relays them as they happen.
+    """
+    document = get_object_or_404(
+        DocumentScan.objects.only('scan_status'), pk=pk, user=request.user
+    )
+
+    current = {
+        'status': document.scan_status,
+        'progress': 100 if document.scan_status == 'completed' else 0,
+    }
+    return _sse_response(f'doc:{pk}', current)
+
+@login_required
+def api_cv_events(request, pk):
+    """Stream CV-generation events for a generated CV over SSE"""
+    cv = get_object_or_404(
+        GeneratedCV.objects.only('generation_status'), pk=pk, user=request.user
+    )
+
+    current = {
+        'status': cv.generation_status,
+        'progress': 100 if cv.generation_status == 'completed' else 0,
+    }
+    return _sse_response(f'cv:{pk}', current)
+
 @login_required
 def api_dashboard_stats(request):
     """Get dashboard statistics"""
-    stats = {
-        'total_documents': DocumentScan.objects.filter(user=request.user).count(),
-        'completed_scans': DocumentScan.objects.filter(
-            user=request.user, 
-            scan_status='completed'
-        ).count(),
-        'processing_scans': DocumentScan.objects.filter(
-            user=request.user, 
-            scan_status='processing'
-        ).count(),
-        'failed_scans': DocumentScan.objects.filter(
-            user=request.user, 
-            scan_status='failed'
-        ).count(),
-        'generated_cvs': GeneratedCV.objects.filter(user=request.user).count(),
-        'active_jobs': DocumentProcessingJob.objects.filter(
-            user=request.user,
-            status__in=['queued', 'processing']
-        ).count(),
-    }
-    
-    return JsonResponse(stats)
+    return JsonResponse(_dashboard_stats(request.user))
 
 # Admin views (for management users)
 
@@ -357,8 +476,8 @@ def admin_dashboard(request):
     }
     
     # Recent activity
-    recent_documents = DocumentScan.objects.select_related('user').order_by('-created_at')[:10]
-    recent_jobs = DocumentProcessingJob.objects.select_related('user').order_by('-created_at')[:10]
+    recent_documents = DocumentScan.list_objects.order_by('-created_at')[:10]
+    recent_jobs = DocumentProcessingJob.list_objects.order_by('-created_at')[:10]
     
     context = {
         'stats': stats,
@@ -371,7 +490,7 @@ def admin_dashboard(request):
 @role_required(['Super Admin', 'Admin'])
 def admin_document_list(request):
     """Admin view of all documents"""
-    documents = DocumentScan.objects.select_related('user').order_by('-created_at')
+    documents = DocumentScan.list_objects.order_by('-created_at')
     
     # Apply filters if provided
     status_filter = request.GET.get('status')